@@ -0,0 +1,55 @@
+"""content change versions and delete tombstones for delta sync
+
+Revision ID: add_change_versions
+Revises: add_search_index
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_change_versions'
+down_revision = 'add_search_index'
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ('systems', 'social_links', 'pages')
+
+
+def upgrade():
+    op.create_table(
+        'content_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'content_tombstones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(length=32), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('change_version', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_content_tombstones_id'), 'content_tombstones', ['id'], unique=False)
+    op.create_index(op.f('ix_content_tombstones_change_version'), 'content_tombstones', ['change_version'], unique=False)
+
+    # Existing content becomes version 1; add_column rather than a batch
+    # rebuild, which would drop the SQLite search triggers on these tables
+    for table in VERSIONED_TABLES:
+        op.add_column(table, sa.Column('change_version', sa.Integer(), nullable=False, server_default='0'))
+        op.execute(f"UPDATE {table} SET change_version = 1")
+        op.create_index(op.f(f'ix_{table}_change_version'), table, ['change_version'], unique=False)
+    op.execute("INSERT INTO content_version (id, value) VALUES (1, 1)")
+
+
+def downgrade():
+    for table in VERSIONED_TABLES:
+        op.drop_index(op.f(f'ix_{table}_change_version'), table_name=table)
+        op.drop_column(table, 'change_version')
+    op.drop_index(op.f('ix_content_tombstones_change_version'), table_name='content_tombstones')
+    op.drop_index(op.f('ix_content_tombstones_id'), table_name='content_tombstones')
+    op.drop_table('content_tombstones')
+    op.drop_table('content_version')
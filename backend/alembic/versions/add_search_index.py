@@ -0,0 +1,25 @@
+"""full-text search index over systems, pages and chat scripts
+
+Revision ID: add_search_index
+Revises: system_key_features_json
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+from app.core.search import drop_search_index, ensure_search_index
+
+# revision identifiers, used by Alembic.
+revision = 'add_search_index'
+down_revision = 'system_key_features_json'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite: FTS5 table plus triggers, backfilled here; PostgreSQL: generated tsvector columns with GIN indexes
+    ensure_search_index(op.get_bind())
+
+
+def downgrade():
+    drop_search_index(op.get_bind())
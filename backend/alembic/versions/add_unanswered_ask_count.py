@@ -0,0 +1,25 @@
+"""add ask_count to unanswered questions
+
+Revision ID: add_unanswered_ask_count
+Revises: add_chat_tables
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_unanswered_ask_count'
+down_revision = 'add_chat_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('unanswered_questions',
+        sa.Column('ask_count', sa.Integer(), nullable=True, server_default='1')
+    )
+
+
+def downgrade():
+    op.drop_column('unanswered_questions', 'ask_count')
@@ -0,0 +1,26 @@
+"""change version on page contexts for the change feed
+
+Revision ID: page_context_change_version
+Revises: add_change_versions
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'page_context_change_version'
+down_revision = 'add_change_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('page_contexts', sa.Column('change_version', sa.Integer(), nullable=False, server_default='0'))
+    op.execute("UPDATE page_contexts SET change_version = 1")
+    op.create_index(op.f('ix_page_contexts_change_version'), 'page_contexts', ['change_version'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_page_contexts_change_version'), table_name='page_contexts')
+    op.drop_column('page_contexts', 'change_version')
@@ -0,0 +1,35 @@
+"""store systems.key_features as native JSON
+
+Revision ID: system_key_features_json
+Revises: add_unanswered_ask_count
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'system_key_features_json'
+down_revision = 'add_unanswered_ask_count'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows were written with json.dumps, so the text is already valid JSON; fill the gaps
+    op.execute("UPDATE systems SET key_features = '[]' WHERE key_features IS NULL OR key_features = ''")
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE systems ALTER COLUMN key_features TYPE JSONB USING key_features::jsonb")
+    else:
+        # SQLite keeps the same TEXT storage under a JSON column type
+        with op.batch_alter_table('systems') as batch_op:
+            batch_op.alter_column('key_features', existing_type=sa.Text(), type_=sa.JSON())
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE systems ALTER COLUMN key_features TYPE TEXT USING key_features::text")
+    else:
+        with op.batch_alter_table('systems') as batch_op:
+            batch_op.alter_column('key_features', existing_type=sa.JSON(), type_=sa.Text())
@@ -0,0 +1,39 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+from ..config import settings
+from ..core.change_feed import HEARTBEAT_FRAME, RETRY_FRAME, change_feed
+from ..core.dependencies import get_current_user
+
+router = APIRouter()
+
+async def event_stream(last_event_id: Optional[str]):
+    with change_feed.subscribe() as queue:
+        yield RETRY_FRAME
+        if last_event_id:
+            missed = await change_feed.since(last_event_id)
+            for frame in missed if missed is not None else [change_feed.reset_frame()]:
+                yield frame
+        while True:
+            try:
+                frame = await asyncio.wait_for(queue.get(), settings.CHANGE_FEED_HEARTBEAT)
+            except asyncio.TimeoutError:
+                # Keeps proxies from timing out idle connections
+                frame = HEARTBEAT_FRAME
+            yield frame
+
+@router.get("/stream")
+async def stream_changes(last_event_id: Optional[str] = Header(None)):
+    """Server-Sent Events: one `change` event ({type, id, version, op}) per edited
+    system, social link, page or page context; `reset` means refetch everything"""
+    return StreamingResponse(
+        event_stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/stats")
+async def change_feed_stats(current_user = Depends(get_current_user)):
+    """Connected subscribers, content version polled up to and slow-client resets"""
+    return change_feed.stats()
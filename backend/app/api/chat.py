@@ -1,97 +1,102 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from difflib import SequenceMatcher
+from collections import Counter
 import re
 
-from database import get_db
-from models.chat_models import ChatScript, UnansweredQuestion, PageContext
-from schemas.chat_schemas import (
+from ..models.database import get_session
+from ..models.chat_models import ChatScript, UnansweredQuestion, PageContext
+from ..schemas.chat_schemas import (
     ChatQuery, ChatResponse, ScriptCreate, ScriptUpdate,
     UnansweredCreate, PageContextCreate
 )
-from core.dependencies import get_current_user
+from ..config import settings
+from ..core.change_feed import change_feed
+from ..core.chat_executor import chat_executor
+from ..core.chat_matcher import get_matcher, normalize_query
+from ..core.script_cache import ScriptSnapshot, script_cache, shard_key
+from ..core.ttl_cache import LRUTTLCache
+from ..core.unanswered_queue import unanswered_queue
+from ..core.usage_buffer import usage_buffer
+from ..core.dependencies import get_current_user
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
-def similarity(a: str, b: str) -> float:
-    """Calculate string similarity for fuzzy matching"""
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+# Answers keyed on (normalized question, page_url), dropped whenever the script snapshot changes
+response_cache = LRUTTLCache(
+    maxsize=settings.CHAT_RESPONSE_CACHE_SIZE,
+    ttl=settings.CHAT_RESPONSE_CACHE_TTL
+)
+
+def cache_key(query: ChatQuery):
+    return (query.question, query.page_url)
+
+async def match_queries(snapshot: ScriptSnapshot, queries: List[ChatQuery]) -> List[ChatResponse]:
+    """Answer queries from the snapshot without touching the database.
+
+    Questions are normalized, cached answers are served directly and the
+    rest are spell-corrected and matched together on the chat executor.
+    """
+    queries = [normalize_query(q) for q in queries]
+    responses = [response_cache.get(cache_key(q), snapshot.version) for q in queries]
+    misses = [i for i, r in enumerate(responses) if r is None]
+    if misses:
+        computed = await chat_executor.match(snapshot, [queries[i] for i in misses])
+        for i, response in zip(misses, computed):
+            responses[i] = response
+            response_cache.set(cache_key(queries[i]), response, snapshot.version)
+
+    for query, response in zip(queries, responses):
+        hit = snapshot.by_id.get(response.script_id) if response.script_id is not None else None
+        script_cache.record_query(shard_key(query.page_url), hit)
+    return responses
 
 @router.post("/query", response_model=ChatResponse)
 async def query_chat(
     query: ChatQuery,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_session)
 ):
     """Main chat endpoint - finds best match or stores unanswered question"""
+    snapshot = await db.run_sync(script_cache.load)
+    response, = await match_queries(snapshot, [query])
 
-    # Get all scripts
-    scripts = db.query(ChatScript).filter(
-        ChatScript.requires_approval == False
-    ).all()
-
-    best_match = None
-    best_score = 0.0
-    threshold = 0.7
-
-    # Fuzzy matching against all questions
-    for script in scripts:
-        score = similarity(query.question, script.question_pattern)
-        if score > best_score:
-            best_score = score
-            best_match = script
-
-    # If good match found
-    if best_match and best_score >= threshold:
-        best_match.usage_count += 1
-        db.commit()
-
-        return ChatResponse(
-            answer=best_match.answer,
-            confidence=best_score,
-            source="database",
-            script_id=best_match.id,
-            suggestions=[]
-        )
-
-    # No good match - store as unanswered
-    unanswered = UnansweredQuestion(
-        question=query.question,
-        user_session=query.session_id,
-        page_url=query.page_url
-    )
-    db.add(unanswered)
-    db.commit()
+    if response.script_id is not None:
+        usage_buffer.add(response.script_id)
+    else:
+        # No good match - queue as unanswered
+        unanswered_queue.add(query.question, query.session_id, query.page_url)
 
-    # Return helpful fallback with suggestions
-    suggestions = get_similar_questions(db, query.question, limit=3)
+    return response
 
-    return ChatResponse(
-        answer="I'm not sure about that yet, but I'm learning! I've noted your question.",
-        confidence=0.0,
-        source="learning",
-        suggestions=suggestions
-    )
+@router.post("/query/batch", response_model=List[ChatResponse])
+async def query_chat_batch(
+    queries: List[ChatQuery] = Body(..., max_length=settings.CHAT_BATCH_MAX),
+    db: AsyncSession = Depends(get_session)
+):
+    """Answer up to CHAT_BATCH_MAX queries against one snapshot"""
+    snapshot = await db.run_sync(script_cache.load)
+    responses = await match_queries(snapshot, queries)
+
+    usage_buffer.update(Counter(r.script_id for r in responses if r.script_id is not None))
+    for query, response in zip(queries, responses):
+        if response.script_id is None:
+            unanswered_queue.add(query.question, query.session_id, query.page_url)
 
-def get_similar_questions(db: Session, question: str, limit: int = 3):
-    """Find similar questions for suggestions"""
-    scripts = db.query(ChatScript).all()
-    scored = [(s, similarity(question, s.question_pattern)) for s in scripts]
-    scored.sort(key=lambda x: x[1], reverse=True)
-    return [{"question": s.question_pattern, "id": s.id} for s, _ in scored[:limit]]
+    return responses
 
 @router.post("/scripts", response_model=dict)
 async def create_script(
     script: ScriptCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
     """Add new Q&A to the vault (admin only)"""
 
     # Check for duplicates
-    existing = db.query(ChatScript).filter(
+    existing = await db.scalar(select(ChatScript).where(
         ChatScript.question_pattern == script.question_pattern
-    ).first()
+    ))
 
     if existing:
         raise HTTPException(status_code=400, detail="Question pattern already exists")
@@ -105,8 +110,9 @@ async def create_script(
         requires_approval=script.requires_approval
     )
     db.add(new_script)
-    db.commit()
-    db.refresh(new_script)
+    await db.commit()
+    await db.refresh(new_script)
+    script_cache.sync(new_script)
 
     return {"id": new_script.id, "message": "Script added successfully"}
 
@@ -114,18 +120,19 @@ async def create_script(
 async def list_scripts(
     category: Optional[str] = None,
     is_learned: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
     """List all chat scripts with filters"""
-    query = db.query(ChatScript)
+    query = select(ChatScript)
 
     if category:
-        query = query.filter(ChatScript.category == category)
+        query = query.where(ChatScript.category == category)
     if is_learned is not None:
-        query = query.filter(ChatScript.is_learned == is_learned)
+        query = query.where(ChatScript.is_learned == is_learned)
 
-    scripts = query.order_by(ChatScript.usage_count.desc()).all()
+    result = await db.execute(query.order_by(ChatScript.usage_count.desc()))
+    scripts = result.scalars().all()
 
     return [{
         "id": s.id,
@@ -142,36 +149,39 @@ async def list_scripts(
 async def update_script(
     script_id: int,
     update: ScriptUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
     """Update a script (admin only)"""
-    script = db.query(ChatScript).filter(ChatScript.id == script_id).first()
+    script = await db.get(ChatScript, script_id)
     if not script:
         raise HTTPException(status_code=404, detail="Script not found")
 
     for field, value in update.dict(exclude_unset=True).items():
         setattr(script, field, value)
 
-    db.commit()
+    await db.commit()
+    script_cache.sync(script)
     return {"message": "Script updated"}
 
 @router.get("/unanswered", response_model=List[dict])
 async def list_unanswered(
     resolved: Optional[bool] = False,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
     """List unanswered questions for admin review"""
-    questions = db.query(UnansweredQuestion).filter(
+    result = await db.execute(select(UnansweredQuestion).where(
         UnansweredQuestion.is_resolved == resolved
-    ).order_by(UnansweredQuestion.created_at.desc()).all()
+    ).order_by(UnansweredQuestion.created_at.desc()))
+    questions = result.scalars().all()
 
     return [{
         "id": q.id,
         "question": q.question,
         "page_url": q.page_url,
         "suggested_answer": q.suggested_answer,
+        "ask_count": q.ask_count,
         "created_at": q.created_at.isoformat(),
         "admin_notes": q.admin_notes
     } for q in questions]
@@ -180,13 +190,11 @@ async def list_unanswered(
 async def resolve_question(
     question_id: int,
     resolution: dict,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
     """Convert unanswered question to learned script"""
-    question = db.query(UnansweredQuestion).filter(
-        UnansweredQuestion.id == question_id
-    ).first()
+    question = await db.get(UnansweredQuestion, question_id)
 
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
@@ -206,7 +214,8 @@ async def resolve_question(
     question.is_resolved = True
     question.admin_notes = resolution.get("notes", "")
 
-    db.commit()
+    await db.commit()
+    script_cache.sync(new_script)
 
     return {
         "message": "Question resolved and added to knowledge base",
@@ -216,30 +225,32 @@ async def resolve_question(
 @router.post("/page-context")
 async def set_page_context(
     context: PageContextCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
     """Set context for a specific page"""
-    existing = db.query(PageContext).filter(
+    existing = await db.scalar(select(PageContext).where(
         PageContext.page_route == context.page_route
-    ).first()
+    ))
 
     if existing:
         for field, value in context.dict().items():
             setattr(existing, field, value)
     else:
-        new_context = PageContext(**context.dict())
-        db.add(new_context)
+        existing = PageContext(**context.dict())
+        db.add(existing)
 
-    db.commit()
+    await db.commit()
+    script_cache.sync_page_context(existing)
+    change_feed.notify()
     return {"message": "Page context updated"}
 
 @router.get("/page-context/{page_route}")
-async def get_page_context(page_route: str, db: Session = Depends(get_db)):
+async def get_page_context(page_route: str, db: AsyncSession = Depends(get_session)):
     """Get context for a specific page"""
-    context = db.query(PageContext).filter(
+    context = await db.scalar(select(PageContext).where(
         PageContext.page_route == page_route
-    ).first()
+    ))
 
     if not context:
         return {"description": "", "key_topics": [], "design_notes": ""}
@@ -253,23 +264,42 @@ async def get_page_context(page_route: str, db: Session = Depends(get_db)):
 
 @router.get("/stats")
 async def get_chat_stats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
     """Get learning statistics"""
-    total_scripts = db.query(ChatScript).count()
-    learned_scripts = db.query(ChatScript).filter(ChatScript.is_learned == True).count()
-    unanswered = db.query(UnansweredQuestion).filter(
+    total_scripts = await db.scalar(select(func.count(ChatScript.id)))
+    learned_scripts = await db.scalar(
+        select(func.count(ChatScript.id)).where(ChatScript.is_learned == True)
+    )
+    unanswered = await db.scalar(select(func.count(UnansweredQuestion.id)).where(
         UnansweredQuestion.is_resolved == False
-    ).count()
-    total_queries = db.query(ChatScript).with_entities(
-        func.sum(ChatScript.usage_count)
-    ).scalar() or 0
+    ))
+    total_queries = await db.scalar(select(func.sum(ChatScript.usage_count))) or 0
 
     return {
         "total_scripts": total_scripts,
         "learned_scripts": learned_scripts,
         "pending_questions": unanswered,
         "total_queries_answered": total_queries,
-        "learning_rate": learned_scripts / total_scripts if total_scripts > 0 else 0
-    }
\ No newline at end of file
+        "learning_rate": learned_scripts / total_scripts if total_scripts > 0 else 0,
+        "unanswered_pending_flush": unanswered_queue.pending,
+        "usage_pending_flush": usage_buffer.pending,
+        "script_snapshot_version": script_cache.version,
+        "index_artifact_mapped": script_cache.mapped is not None,
+        "match_engine": get_matcher().name,
+        "shards": script_cache.shard_stats()
+    }
+
+@router.get("/stats/cache")
+async def get_chat_cache_stats(current_user = Depends(get_current_user)):
+    """Hit, miss and eviction counters of the chat response cache"""
+    return {
+        "script_snapshot_version": script_cache.version,
+        **response_cache.stats()
+    }
+
+@router.get("/stats/executor")
+async def get_chat_executor_stats(current_user = Depends(get_current_user)):
+    """Execution mode, concurrency limit and queue depth of chat matching"""
+    return chat_executor.stats()
\ No newline at end of file
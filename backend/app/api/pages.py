@@ -1,28 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from ..models.database import get_db
+from ..models.database import get_session
 from ..models.page import Page
 from ..schemas.page import PageCreate, PageUpdate, PageInDB
+from ..core.change_feed import change_feed
+from ..core.content_cache import content_cache
 from ..core.dependencies import get_current_user
+from ..core.http_cache import cached_content, conditional
+from ..core.surrogate_keys import cache_purger, page_key
 
 router = APIRouter()
 
+async def published_page(db: AsyncSession, page_name: str):
+    """Cached published page, or None"""
+    async def load():
+        result = await db.execute(select(Page).where(Page.name == page_name, Page.is_published == True))
+        page = result.scalars().first()
+        return cached_content(PageInDB.model_validate(page)) if page else None
+    return await content_cache.get("pages", page_name, load)
+
 @router.get("/{page_name}", response_model=PageInDB)
-async def get_page(page_name: str, db: Session = Depends(get_db)):
-    page = db.query(Page).filter(Page.name == page_name, Page.is_published == True).first()
+async def get_page(page_name: str, request: Request, db: AsyncSession = Depends(get_session)):
+    await content_cache.refresh(db)
+    page = await published_page(db, page_name)
     if not page:
         raise HTTPException(status_code=404, detail="Page not found")
-    return page
+    return conditional(request, page, [page_key(page_name)])
 
 @router.put("/{page_id}", response_model=PageInDB)
 async def update_page(
     page_id: int,
     page_update: PageUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
-    db_page = db.query(Page).filter(Page.id == page_id).first()
+    db_page = await db.get(Page, page_id)
     if not db_page:
         raise HTTPException(status_code=404, detail="Page not found")
     
@@ -30,6 +44,9 @@ async def update_page(
     for field, value in update_data.items():
         setattr(db_page, field, value)
     
-    db.commit()
-    db.refresh(db_page)
+    await db.commit()
+    await db.refresh(db_page)
+    content_cache.invalidate("pages")
+    change_feed.notify()
+    await cache_purger.purge(page_key(db_page.name))
     return db_page
\ No newline at end of file
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.database import get_session
+from ..schemas.search import SearchResults
+from ..core.search import search
+
+router = APIRouter()
+
+@router.get("/", response_model=SearchResults)
+async def search_site(
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_session)
+):
+    """Ranked full-text search over active systems, published pages and approved chat scripts"""
+    total, hits = await db.run_sync(search, q, page_size, (page - 1) * page_size)
+    return {"query": q, "total": total, "page": page, "page_size": page_size, "results": hits}
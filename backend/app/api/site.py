@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.database import get_session
+from ..schemas.site import SiteBootstrap
+from ..core.content_cache import content_cache
+from ..core.http_cache import cached_content, conditional
+from ..core.surrogate_keys import page_key, social_list, systems_list
+from .pages import published_page
+from .social import active_social_links
+from .systems import active_systems
+
+router = APIRouter()
+
+@router.get("/bootstrap", response_model=SiteBootstrap)
+async def get_bootstrap(
+    request: Request,
+    pages: str = Query("home", description="Comma-separated page names to include"),
+    db: AsyncSession = Depends(get_session)
+):
+    """Active systems, active social links and the requested published pages in one payload"""
+    names = tuple(sorted({name.strip() for name in pages.split(",") if name.strip()}))
+
+    async def load():
+        systems = await active_systems(db)
+        social_links = await active_social_links(db)
+        found = {}
+        for name in names:
+            page = await published_page(db, name)
+            if page:
+                found[name] = page.value
+        return cached_content(SiteBootstrap(systems=systems.value, social_links=social_links.value, pages=found))
+
+    await content_cache.refresh(db)
+    # Keyed on the section versions, so any admin write to them regenerates the payload
+    key = (content_cache.versions["systems"], content_cache.versions["social"], content_cache.versions["pages"], names)
+    surrogate_keys = [systems_list(), social_list(), *(page_key(name) for name in names)]
+    return conditional(request, await content_cache.get("site", key, load), surrogate_keys)
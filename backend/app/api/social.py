@@ -1,38 +1,86 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from ..models.database import get_db
+from ..models.database import get_session
 from ..models.social import SocialLink
-from ..schemas.social import SocialLinkCreate, SocialLinkUpdate, SocialLinkInDB
+from ..schemas.social import SocialLinkCreate, SocialLinkUpdate, SocialLinkBulkUpdate, SocialLinkInDB
+from ..core.change_feed import change_feed
+from ..core.content_cache import content_cache
 from ..core.dependencies import get_current_user
+from ..core.http_cache import cached_content, conditional
+from ..core.surrogate_keys import cache_purger, social_list
 
 router = APIRouter()
 
+async def active_social_links(db: AsyncSession):
+    """Cached list of active social links in display order"""
+    async def load():
+        result = await db.execute(
+            select(SocialLink).where(SocialLink.is_active == True).order_by(SocialLink.order)
+        )
+        return cached_content([SocialLinkInDB.model_validate(link) for link in result.scalars().all()])
+    return await content_cache.get("social", "list", load)
+
 @router.get("/", response_model=List[SocialLinkInDB])
-async def get_social_links(db: Session = Depends(get_db)):
-    links = db.query(SocialLink).filter(SocialLink.is_active == True).order_by(SocialLink.order).all()
-    return links
+async def get_social_links(request: Request, db: AsyncSession = Depends(get_session)):
+    await content_cache.refresh(db)
+    return conditional(request, await active_social_links(db), [social_list()])
 
 @router.post("/", response_model=SocialLinkInDB, status_code=status.HTTP_201_CREATED)
 async def create_social_link(
     link: SocialLinkCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
     db_link = SocialLink(**link.dict())
     db.add(db_link)
-    db.commit()
-    db.refresh(db_link)
+    await db.commit()
+    await db.refresh(db_link)
+    content_cache.invalidate("social")
+    change_feed.notify()
+    await cache_purger.purge(social_list())
     return db_link
 
+@router.patch("/bulk", response_model=List[SocialLinkInDB])
+async def bulk_update_social_links(
+    updates: List[SocialLinkBulkUpdate],
+    db: AsyncSession = Depends(get_session),
+    current_user = Depends(get_current_user)
+):
+    """Apply partial updates (e.g. a new `order` for every link) in one transaction"""
+    ids = [update.id for update in updates]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Each social link may appear only once")
+    result = await db.execute(select(SocialLink).where(SocialLink.id.in_(ids)))
+    db_links = {link.id: link for link in result.scalars().all()}
+    missing = [link_id for link_id in ids if link_id not in db_links]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Social links not found: {missing}")
+
+    for update in updates:
+        for field, value in update.dict(exclude_unset=True, exclude={"id"}).items():
+            setattr(db_links[update.id], field, value)
+
+    await db.commit()
+    content_cache.invalidate("social")
+    change_feed.notify()
+    await cache_purger.purge(social_list())
+    # One query reloads the server-set updated_at for the whole batch
+    result = await db.execute(
+        select(SocialLink).where(SocialLink.id.in_(ids)).execution_options(populate_existing=True)
+    )
+    db_links = {link.id: link for link in result.scalars().all()}
+    return [db_links[link_id] for link_id in ids]
+
 @router.put("/{link_id}", response_model=SocialLinkInDB)
 async def update_social_link(
     link_id: int,
     link_update: SocialLinkUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
-    db_link = db.query(SocialLink).filter(SocialLink.id == link_id).first()
+    db_link = await db.get(SocialLink, link_id)
     if not db_link:
         raise HTTPException(status_code=404, detail="Social link not found")
     
@@ -40,20 +88,26 @@ async def update_social_link(
     for field, value in update_data.items():
         setattr(db_link, field, value)
     
-    db.commit()
-    db.refresh(db_link)
+    await db.commit()
+    await db.refresh(db_link)
+    content_cache.invalidate("social")
+    change_feed.notify()
+    await cache_purger.purge(social_list())
     return db_link
 
 @router.delete("/{link_id}")
 async def delete_social_link(
     link_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
-    db_link = db.query(SocialLink).filter(SocialLink.id == link_id).first()
+    db_link = await db.get(SocialLink, link_id)
     if not db_link:
         raise HTTPException(status_code=404, detail="Social link not found")
     
-    db.delete(db_link)
-    db.commit()
+    await db.delete(db_link)
+    await db.commit()
+    content_cache.invalidate("social")
+    change_feed.notify()
+    await cache_purger.purge(social_list())
     return {"message": "Social link deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.database import get_session
+from ..models.content_version import ContentTombstone, ContentVersion
+from ..models.page import Page
+from ..models.social import SocialLink
+from ..models.system import System
+from ..schemas.sync import SyncResponse
+
+router = APIRouter()
+
+# (response field, model, visibility column, display order)
+COLLECTIONS = (
+    ("systems", System, System.is_active, System.order),
+    ("social_links", SocialLink, SocialLink.is_active, SocialLink.order),
+    ("pages", Page, Page.is_published, Page.id),
+)
+
+async def collection_changes(db: AsyncSession, model, visible, order, since: int, full: bool) -> dict:
+    if full:
+        result = await db.execute(select(model).where(visible == True).order_by(order))
+        return {"updated": result.scalars().all(), "deleted": []}
+
+    result = await db.execute(select(model).where(model.change_version > since).order_by(order))
+    rows = result.scalars().all()
+    # Rows hidden since the client's copy count as deletions for it
+    updated = [row for row in rows if getattr(row, visible.key)]
+    hidden = {row.id for row in rows if not getattr(row, visible.key)}
+    result = await db.execute(select(ContentTombstone.entity_id).where(
+        ContentTombstone.entity_type == model.__change_type__,
+        ContentTombstone.change_version > since
+    ))
+    # An id reused by a newer row is that row, not a deletion
+    deleted = (set(result.scalars().all()) - {row.id for row in rows}) | hidden
+    return {"updated": updated, "deleted": sorted(deleted)}
+
+@router.get("/", response_model=SyncResponse)
+async def sync_content(since: int = Query(0, ge=0), db: AsyncSession = Depends(get_session)):
+    """Systems, social links and pages created, updated or deleted after version `since`"""
+    # Read the version first: rows changed after this read only get sent twice, never skipped
+    version = await db.scalar(select(ContentVersion.value)) or 0
+    full = since == 0 or since > version
+    response = {"version": version, "full": full}
+    for field, model, visible, order in COLLECTIONS:
+        response[field] = await collection_changes(db, model, visible, order, since, full)
+    return response
@@ -1,32 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-import json
-from ..models.database import get_db
+from ..models.database import get_session
 from ..models.system import System
-from ..schemas.system import SystemCreate, SystemUpdate, SystemInDB
+from ..schemas.system import SystemCreate, SystemUpdate, SystemBulkUpdate, SystemInDB
+from ..core.change_feed import change_feed
+from ..core.content_cache import content_cache
 from ..core.dependencies import get_current_user
+from ..core.http_cache import cached_content, conditional
+from ..core.surrogate_keys import cache_purger, system_key, systems_list
 
 router = APIRouter()
 
+async def active_systems(db: AsyncSession):
+    """Cached list of active systems in display order"""
+    async def load():
+        result = await db.execute(select(System).where(System.is_active == True).order_by(System.order))
+        return cached_content([SystemInDB.model_validate(s) for s in result.scalars().all()])
+    return await content_cache.get("systems", "list", load)
+
 # Public endpoints
 @router.get("/", response_model=List[SystemInDB])
-async def get_systems(db: Session = Depends(get_db)):
-    systems = db.query(System).filter(System.is_active == True).order_by(System.order).all()
-    return systems
+async def get_systems(request: Request, db: AsyncSession = Depends(get_session)):
+    await content_cache.refresh(db)
+    return conditional(request, await active_systems(db), [systems_list()])
 
 @router.get("/{slug}", response_model=SystemInDB)
-async def get_system(slug: str, db: Session = Depends(get_db)):
-    system = db.query(System).filter(System.slug == slug, System.is_active == True).first()
+async def get_system(slug: str, request: Request, db: AsyncSession = Depends(get_session)):
+    async def load():
+        result = await db.execute(select(System).where(System.slug == slug, System.is_active == True))
+        system = result.scalars().first()
+        return cached_content(SystemInDB.model_validate(system)) if system else None
+    await content_cache.refresh(db)
+    system = await content_cache.get("systems", slug, load)
     if not system:
         raise HTTPException(status_code=404, detail="System not found")
-    return system
+    return conditional(request, system, [system_key(system.value)])
 
 # Admin endpoints
 @router.post("/", response_model=SystemInDB, status_code=status.HTTP_201_CREATED)
 async def create_system(
     system: SystemCreate, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
     db_system = System(
@@ -34,49 +50,86 @@ async def create_system(
         slug=system.slug,
         title=system.title,
         description=system.description,
-        key_features=json.dumps(system.key_features),
+        key_features=system.key_features,
         learn_more_url=system.learn_more_url,
         icon=system.icon,
         order=system.order,
         is_active=system.is_active
     )
     db.add(db_system)
-    db.commit()
-    db.refresh(db_system)
+    await db.commit()
+    await db.refresh(db_system)
+    content_cache.invalidate("systems")
+    change_feed.notify()
+    await cache_purger.purge(systems_list(), system_key(db_system))
     return db_system
 
+@router.patch("/bulk", response_model=List[SystemInDB])
+async def bulk_update_systems(
+    updates: List[SystemBulkUpdate],
+    db: AsyncSession = Depends(get_session),
+    current_user = Depends(get_current_user)
+):
+    """Apply partial updates (e.g. a new `order` for every system) in one transaction"""
+    ids = [update.id for update in updates]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Each system may appear only once")
+    result = await db.execute(select(System).where(System.id.in_(ids)))
+    db_systems = {s.id: s for s in result.scalars().all()}
+    missing = [system_id for system_id in ids if system_id not in db_systems]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Systems not found: {missing}")
+
+    for update in updates:
+        for field, value in update.dict(exclude_unset=True, exclude={"id"}).items():
+            setattr(db_systems[update.id], field, value)
+
+    await db.commit()
+    content_cache.invalidate("systems")
+    change_feed.notify()
+    await cache_purger.purge(systems_list(), *(system_key(s) for s in db_systems.values()))
+    # One query reloads the server-set updated_at for the whole batch
+    result = await db.execute(
+        select(System).where(System.id.in_(ids)).execution_options(populate_existing=True)
+    )
+    db_systems = {s.id: s for s in result.scalars().all()}
+    return [db_systems[system_id] for system_id in ids]
+
 @router.put("/{system_id}", response_model=SystemInDB)
 async def update_system(
     system_id: int,
     system_update: SystemUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
-    db_system = db.query(System).filter(System.id == system_id).first()
+    db_system = await db.get(System, system_id)
     if not db_system:
         raise HTTPException(status_code=404, detail="System not found")
     
     update_data = system_update.dict(exclude_unset=True)
-    if "key_features" in update_data and update_data["key_features"] is not None:
-        update_data["key_features"] = json.dumps(update_data["key_features"])
-    
     for field, value in update_data.items():
         setattr(db_system, field, value)
     
-    db.commit()
-    db.refresh(db_system)
+    await db.commit()
+    await db.refresh(db_system)
+    content_cache.invalidate("systems")
+    change_feed.notify()
+    await cache_purger.purge(systems_list(), system_key(db_system))
     return db_system
 
 @router.delete("/{system_id}")
 async def delete_system(
     system_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     current_user = Depends(get_current_user)
 ):
-    db_system = db.query(System).filter(System.id == system_id).first()
+    db_system = await db.get(System, system_id)
     if not db_system:
         raise HTTPException(status_code=404, detail="System not found")
     
-    db.delete(db_system)
-    db.commit()
+    await db.delete(db_system)
+    await db.commit()
+    content_cache.invalidate("systems")
+    change_feed.notify()
+    await cache_purger.purge(systems_list(), system_key(db_system))
     return {"message": "System deleted successfully"}
\ No newline at end of file
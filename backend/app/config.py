@@ -8,6 +8,10 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./pro_prime.db"
+    # Serve the API routers from an asyncio engine (aiosqlite / asyncpg) instead of
+    # sync sessions in the threadpool; the async URL is derived from DATABASE_URL if unset
+    DATABASE_ASYNC: bool = False
+    DATABASE_ASYNC_URL: str = ""
     
     # JWT
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -19,6 +23,89 @@ class Settings(BaseSettings):
     ADMIN_USERNAME: str = "admin"
     ADMIN_PASSWORD: str = "changeme123"
     
+    # Read-through cache of public systems, social links and pages (0 disables)
+    CONTENT_CACHE_SIZE: int = 256
+    CONTENT_CACHE_TTL: float = 300.0
+    # Seconds between checks of the content version for writes made by other
+    # workers; above 0, a worker may serve (and nginx re-cache) content up to
+    # this old after a purge
+    CONTENT_CACHE_CHECK_INTERVAL: float = 0.0
+    
+    # Cache-Control sent with ETag-validated public content (systems, social links, pages)
+    PUBLIC_CACHE_CONTROL: str = "public, max-age=0, must-revalidate"
+    
+    # nginx proxy_cache purge endpoint (e.g. http://frontend/purge); admin writes
+    # PURGE the URLs of the surrogate keys they touch. Empty disables purging
+    CACHE_PURGE_URL: str = ""
+    CACHE_PURGE_TIMEOUT: float = 2.0
+    
+    # gzip/brotli response compression: bodies below this many bytes are sent as-is
+    COMPRESSION_MIN_SIZE: int = 500
+    
+    # Server-Sent Events change feed: per-client queue bound, events kept for
+    # Last-Event-ID resume, idle heartbeat (seconds) and client reconnect delay
+    CHANGE_FEED_QUEUE_SIZE: int = 100
+    CHANGE_FEED_BACKLOG: int = 1000
+    CHANGE_FEED_HEARTBEAT: float = 15.0
+    CHANGE_FEED_RETRY_MS: int = 3000
+    # Seconds between polls of the content version for writes made by other workers
+    CHANGE_FEED_POLL_INTERVAL: float = 1.0
+    
+    # Static export of public payloads for nginx (export_static.py); with
+    # STATIC_EXPORT_ON_WRITE the app re-exports STATIC_EXPORT_DELAY seconds after admin writes
+    STATIC_EXPORT_DIR: str = ""
+    STATIC_EXPORT_ON_WRITE: bool = False
+    STATIC_EXPORT_DELAY: float = 1.0
+    
+    # Chat matching engine: "sequence" (difflib) or "tfidf" (NumPy vectorised)
+    CHAT_MATCH_ENGINE: str = "sequence"
+    # Minimum score for an answer, per engine: difflib ratios and TF-IDF cosines
+    # are on different scales (see check_match_thresholds.py)
+    CHAT_SEQUENCE_THRESHOLD: float = 0.7
+    CHAT_TFIDF_THRESHOLD: float = 0.45
+    # Scripts with the most trigram overlap that the sequence engine scores first in
+    # each shard, to raise the bar for its exact quick_ratio sweep over the rest.
+    # Only affects speed, not answers (0 scores every script sharing a trigram first)
+    CHAT_CANDIDATE_LIMIT: int = 5
+    
+    # Write-behind usage_count buffer: flush every N seconds or once this many hits are pending
+    CHAT_USAGE_FLUSH_INTERVAL: float = 5.0
+    CHAT_USAGE_FLUSH_SIZE: int = 500
+    
+    # Unanswered question ingestion: repeats per session within the window fold into one row
+    CHAT_UNANSWERED_FLUSH_INTERVAL: float = 2.0
+    CHAT_UNANSWERED_FLUSH_SIZE: int = 200
+    CHAT_UNANSWERED_DEDUP_WINDOW: float = 300.0
+    
+    # Most questions one /api/chat/query/batch request may carry
+    CHAT_BATCH_MAX: int = 50
+    
+    # Chat response cache (0 disables)
+    CHAT_RESPONSE_CACHE_SIZE: int = 1024
+    CHAT_RESPONSE_CACHE_TTL: float = 300.0
+    
+    # Typo correction of chat questions against script and page topic vocabulary
+    CHAT_SPELL_CORRECTION: bool = True
+    CHAT_SPELL_MAX_DISTANCE: int = 2
+    
+    # Page-context shards: boost added to page-local scores, and whether to search
+    # the remaining shards when the page and global shards have no match
+    CHAT_PAGE_BOOST: float = 0.05
+    CHAT_SHARD_FALLBACK: bool = True
+    
+    # Seconds between checks of the content version for script and page context
+    # writes made by other workers; a change rebuilds this worker's snapshot
+    CHAT_SNAPSHOT_CHECK_INTERVAL: float = 5.0
+    
+    # Memory-mapped chat index artifact whose trigram postings workers share ("" disables)
+    CHAT_INDEX_SNAPSHOT_PATH: str = ""
+    
+    # Where chat matching runs: "inline" (event loop), "thread" or "process"
+    CHAT_EXECUTION_MODE: str = "inline"
+    CHAT_MATCH_WORKERS: int = 2
+    CHAT_THREAD_WORKERS: int = 8
+    CHAT_MAX_CONCURRENCY: int = 32
+    
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.chat_models import PageContext
+from ..models.content_version import ContentTombstone, current_change_version
+from ..models.database import SessionLocal
+from ..models.page import Page
+from ..models.social import SocialLink
+from ..models.system import System
+from .http_cache import dump_json
+
+logger = logging.getLogger(__name__)
+
+RETRY_FRAME = f"retry: {settings.CHANGE_FEED_RETRY_MS}\n\n".encode()
+HEARTBEAT_FRAME = b": ping\n\n"
+
+# Versioned models whose edits are reported as change events
+FEED_MODELS = (System, SocialLink, Page, PageContext)
+
+def event_frame(event_id: str, event: str, data: dict) -> bytes:
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (event_id.encode(), event.encode(), dump_json(data))
+
+def changes_since(db: Session, since: int) -> Tuple[int, List[Tuple[int, str, int, str]]]:
+    """The content version and the (version, type, id, op) of every entity
+    changed after `since` up to it, oldest first"""
+    # Read the version first, as /api/sync does: rows stamped above it are left for the next poll
+    version = current_change_version(db)
+    if version <= since:
+        return version, []
+    changes = []
+    for model in FEED_MODELS:
+        rows = db.execute(select(model.change_version, model.id).where(
+            model.change_version > since, model.change_version <= version
+        ))
+        changes += [(change_version, model.__change_type__, entity_id, "update") for change_version, entity_id in rows]
+    rows = db.execute(select(ContentTombstone.change_version, ContentTombstone.entity_type, ContentTombstone.entity_id).where(
+        ContentTombstone.change_version > since, ContentTombstone.change_version <= version
+    ))
+    changes += [(change_version, entity_type, entity_id, "delete") for change_version, entity_type, entity_id in rows]
+    return version, sorted(changes)
+
+class ChangeFeed:
+    """Fan-out of content change events to Server-Sent Events clients.
+
+    Every worker follows the database rather than the writes it handled
+    itself: `poll` reads the content version and, once it has moved, the
+    versioned rows and tombstones stamped since the last poll, and publishes
+    one event per changed entity in version order. The feed polls every
+    CHANGE_FEED_POLL_INTERVAL seconds while started; admin writes call
+    `notify()` after committing so the worker that took the write reports it
+    without waiting for the interval.
+
+    Each event is encoded to its SSE frame once and handed to every
+    subscriber's bounded asyncio queue, so an idle client costs one queue and
+    one parked coroutine, not a thread. A subscriber whose queue fills up has
+    its backlog replaced by a single `reset` event, telling it to refetch
+    everything rather than holding up the publisher. The last
+    CHANGE_FEED_BACKLOG events are kept so reconnecting clients can resume
+    from Last-Event-ID. Event ids are the row's change version, the same in
+    every worker and across restarts, so a client can resume against any
+    worker; ids older than the backlog are answered with `reset`.
+    """
+
+    def __init__(self, queue_size: int, backlog: int, poll_interval: float):
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        # Content version polled up to, and the version the backlog is complete after
+        self.version: Optional[int] = None
+        self.floor: Optional[int] = None
+        self.resets = 0
+        self._backlog: Deque[Tuple[int, bytes]] = deque(maxlen=backlog)
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._lock = asyncio.Lock()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self):
+        """Poll now: called after committing an admin write"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def poll(self):
+        async with self._lock:
+            version, changes = await asyncio.to_thread(self._read, self.version)
+            if self.version is None:
+                # Events before the feed started are not replayed
+                self.version = self.floor = version
+                return
+            self.version = max(self.version, version)
+            for change_version, entity_type, entity_id, op in changes:
+                self._publish(change_version, entity_type, entity_id, op)
+
+    def reset_frame(self) -> bytes:
+        version = self.version or 0
+        return event_frame(str(version), "reset", {"version": version})
+
+    async def since(self, last_event_id: str) -> Optional[List[bytes]]:
+        """Frames published after `last_event_id`, or None when it is malformed
+        or some of the frames are no longer kept"""
+        if not last_event_id.isdigit():
+            return None
+        last_version = int(last_event_id)
+        if self.version is None or last_version > self.version:
+            # Seen by the client on a worker that polled more recently
+            await self.poll()
+        if last_version > self.version:
+            return None
+        if last_version < self.floor:
+            return None
+        return [frame for version, frame in self._backlog if version > last_version]
+
+    @contextmanager
+    def subscribe(self) -> Iterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+    async def start(self):
+        # Created here so the event belongs to the serving loop
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "version": self.version,
+            "resets": self.resets,
+            "backlog": len(self._backlog)
+        }
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                await self.poll()
+            except Exception:
+                logger.exception("Failed to poll content changes")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _read(self, since: Optional[int]) -> Tuple[int, List[Tuple[int, str, int, str]]]:
+        db = SessionLocal()
+        try:
+            if since is None:
+                return current_change_version(db), []
+            return changes_since(db, since)
+        finally:
+            db.close()
+
+    def _publish(self, version: int, entity_type: str, entity_id: int, op: str):
+        frame = event_frame(str(version), "change", {
+            "type": entity_type, "id": entity_id, "version": version, "op": op
+        })
+        if len(self._backlog) == self._backlog.maxlen:
+            # Dropping the oldest event leaves the backlog complete only after its version
+            self.floor = self._backlog[0][0]
+        self._backlog.append((version, frame))
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._reset(queue)
+
+    def _reset(self, queue: asyncio.Queue):
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(self.reset_frame())
+        self.resets += 1
+
+change_feed = ChangeFeed(
+    queue_size=settings.CHANGE_FEED_QUEUE_SIZE,
+    backlog=settings.CHANGE_FEED_BACKLOG,
+    poll_interval=settings.CHANGE_FEED_POLL_INTERVAL
+)
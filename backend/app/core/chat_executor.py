@@ -0,0 +1,149 @@
+import asyncio
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+from typing import List, Optional
+
+from ..config import settings
+from ..schemas.chat_schemas import ChatQuery, ChatResponse
+from .chat_matcher import compute_response, corrected_question
+from .script_cache import ScriptSnapshot, script_cache
+
+EXECUTION_MODES = ("inline", "thread", "process")
+ARTIFACT_PREFIX = "snapshot:"
+
+# Parent snapshot version the worker's mapped artifact was written at
+_worker_version = -1
+
+def correct_queries(queries: List[ChatQuery]) -> List[Optional[str]]:
+    return [corrected_question(query.question) for query in queries]
+
+def _match_in_worker(path: str, version: int, queries: List[ChatQuery],
+                     corrections: List[Optional[str]]) -> List[ChatResponse]:
+    global _worker_version
+    if _worker_version < version:
+        from .index_snapshot import open_artifact
+
+        # The file may already hold a newer snapshot than the one this job was
+        # submitted against; answering from it is fine and saves a reload
+        mapped = open_artifact(path)
+        if mapped is None:
+            raise RuntimeError(f"Chat worker could not map snapshot artifact {path}")
+        script_cache.install_mapped(mapped)
+        _worker_version = int(mapped.content_hash[len(ARTIFACT_PREFIX):])
+    snapshot = script_cache.snapshot
+    return [compute_response(snapshot, query, corrected) for query, corrected in zip(queries, corrections)]
+
+class ChatExecutor:
+    """Runs chat matching off the event loop.
+
+    CHAT_EXECUTION_MODE selects where matching runs: "inline" on the event
+    loop, "thread" in a pool of CHAT_THREAD_WORKERS threads, or "process" in a pool of
+    CHAT_MATCH_WORKERS processes. Process workers are started once (forkserver,
+    or spawn where that is unavailable) and never inherit the parent's state:
+    each new snapshot version is written to a memory-mappable artifact, and a
+    worker maps it the first time it gets a job for that version.
+    Spell correction runs alongside the matching, or in the thread pool for
+    process workers, which do not hold the vocabulary.
+    At most CHAT_MAX_CONCURRENCY match jobs run at once; the rest wait, and
+    how many are waiting is reported as the queue depth.
+    """
+
+    def __init__(self, mode: str, workers: int, thread_workers: int, max_concurrency: int):
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown CHAT_EXECUTION_MODE: {mode}")
+        self.mode = mode
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.completed = 0
+        self._threads = ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="chat-match")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_version: Optional[int] = None
+        self._pool_lock = Lock()
+        self._artifact_dir: Optional[str] = None
+
+    async def match(self, snapshot: ScriptSnapshot, queries: List[ChatQuery]) -> List[ChatResponse]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.queue_depth += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+
+        self.in_flight += 1
+        try:
+            if self.mode == "process":
+                loop = asyncio.get_running_loop()
+                corrections = await loop.run_in_executor(self._threads, correct_queries, queries)
+                pool, path = await loop.run_in_executor(self._threads, self._process_pool, snapshot)
+                return await loop.run_in_executor(pool, _match_in_worker, path, snapshot.version, queries, corrections)
+            if self.mode == "thread":
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._threads, self._match_inline, snapshot, queries
+                )
+            return self._match_inline(snapshot, queries)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "process_workers": self.workers if self.mode == "process" else 0,
+            "pool_snapshot_version": self._pool_version
+        }
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+                self._pool_version = None
+            if self._artifact_dir is not None:
+                shutil.rmtree(self._artifact_dir, ignore_errors=True)
+                self._artifact_dir = None
+        self._threads.shutdown(wait=False)
+
+    @staticmethod
+    def _match_inline(snapshot: ScriptSnapshot, queries: List[ChatQuery]) -> List[ChatResponse]:
+        return [
+            compute_response(snapshot, query, corrected)
+            for query, corrected in zip(queries, correct_queries(queries))
+        ]
+
+    def _process_pool(self, snapshot: ScriptSnapshot):
+        """The worker pool and the artifact path holding `snapshot` (or a newer one)"""
+        from .index_snapshot import write_artifact
+
+        with self._pool_lock:
+            if self._pool is None:
+                # Not fork: the children would inherit the event loop, locks and sockets
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                self._artifact_dir = tempfile.mkdtemp(prefix="chat-workers-")
+            path = os.path.join(self._artifact_dir, "snapshot.chatix")
+            if self._pool_version is None or self._pool_version < snapshot.version:
+                # Replaced atomically: workers still on the old file keep their mapping
+                write_artifact(path, list(snapshot.entries), f"{ARTIFACT_PREFIX}{snapshot.version}")
+                self._pool_version = snapshot.version
+            return self._pool, path
+
+chat_executor = ChatExecutor(
+    mode=settings.CHAT_EXECUTION_MODE,
+    workers=settings.CHAT_MATCH_WORKERS,
+    thread_workers=settings.CHAT_THREAD_WORKERS,
+    max_concurrency=settings.CHAT_MAX_CONCURRENCY
+)
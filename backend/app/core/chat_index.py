@@ -0,0 +1,129 @@
+import heapq
+import math
+from collections import Counter, defaultdict
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import numpy as np
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of the lowercased text, padded so short strings still index"""
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def min_shared_trigrams(question: str, threshold: float) -> int:
+    """Trigrams a script should share with the question to be worth scoring
+    first.
+
+    Each question character missing from a pattern that scores `threshold`
+    removes at most three of the question's trigrams. The bound assumes the
+    pattern is about as long as the question, so it is a heuristic: short
+    strings with transposed characters ("alci" / "cali", ratio 0.75) can
+    reach the threshold while sharing no trigram at all. Use it to order
+    work, never to rule a script out.
+    """
+    grams = trigrams(question)
+    return max(1, len(grams) - math.ceil(3 * (1 - threshold) * len(question)))
+
+class CharCountMatrix:
+    """Sparse per-entry character counts of a set of patterns.
+
+    `bounds` gives difflib's quick_ratio of a question against every row in
+    one gather-minimum-bincount pass. quick_ratio counts the characters the
+    two strings share regardless of order, so it is never below ratio: a row
+    whose bound is under a score can be skipped without scoring it.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        counts = [Counter(p) for p in patterns]
+        self.vocab: Dict[str, int] = {}
+        for chars in counts:
+            for ch in chars:
+                self.vocab.setdefault(ch, len(self.vocab))
+        self.lengths = np.array([len(p) for p in patterns], dtype=np.int64)
+        nnz = sum(len(chars) for chars in counts)
+        self.rows = np.empty(nnz, dtype=np.int32)
+        self.cols = np.empty(nnz, dtype=np.int32)
+        self.data = np.empty(nnz, dtype=np.int32)
+        pos = 0
+        for row, chars in enumerate(counts):
+            end = pos + len(chars)
+            self.rows[pos:end] = row
+            self.cols[pos:end] = [self.vocab[ch] for ch in chars]
+            self.data[pos:end] = list(chars.values())
+            pos = end
+
+    def bounds(self, question: str) -> np.ndarray:
+        query = np.zeros(len(self.vocab), dtype=np.int32)
+        for ch, count in Counter(question).items():
+            col = self.vocab.get(ch)
+            if col is not None:
+                query[col] = count
+        shared = np.bincount(self.rows, weights=np.minimum(self.data, query[self.cols]), minlength=len(self.lengths))
+        total = self.lengths + len(question)
+        # Same expression as difflib's _calculate_ratio, so bound and ratio compare exactly
+        return np.where(total > 0, 2.0 * shared / np.maximum(total, 1), 1.0)
+
+class TrigramIndex:
+    """In-memory inverted index from character trigrams to chat script ids.
+
+    Picks the scripts most likely to score well: those sharing at least
+    `min_shared` trigrams with the question, and of those only the `limit`
+    with the largest overlap. Trigram overlap is not a bound on the
+    similarity score (a script with little overlap can still score above
+    the match threshold), so callers that need exact answers must not treat
+    the rest as ruled out.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._patterns: Dict[int, str] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def rebuild(self, rows: Iterable[Tuple[int, str]]):
+        """Replace the index contents with the given (script_id, pattern) rows"""
+        with self._lock:
+            self._postings = defaultdict(set)
+            self._patterns = {}
+            for script_id, pattern in rows:
+                self._add(script_id, pattern)
+
+    def add(self, script_id: int, pattern: str):
+        with self._lock:
+            self._remove(script_id)
+            self._add(script_id, pattern)
+
+    def remove(self, script_id: int):
+        with self._lock:
+            self._remove(script_id)
+
+    def candidates(self, question: str, min_shared: int = 1, limit: Optional[int] = None) -> List[Tuple[int, str]]:
+        """(script_id, pattern) pairs sharing `min_shared` or more trigrams with
+        the question, at most `limit` of them by overlap, in id order"""
+        with self._lock:
+            overlap: Counter = Counter()
+            for gram in trigrams(question):
+                overlap.update(self._postings.get(gram, ()))
+            ids = [script_id for script_id, shared in overlap.items() if shared >= min_shared]
+            if limit is not None and len(ids) > limit:
+                # Ties at the cut go to the lower id, as in the mapped artifact
+                ids = heapq.nsmallest(limit, ids, key=lambda script_id: (-overlap[script_id], script_id))
+            return [(script_id, self._patterns[script_id]) for script_id in sorted(ids)]
+
+    def _add(self, script_id: int, pattern: str):
+        self._patterns[script_id] = pattern
+        for gram in trigrams(pattern):
+            self._postings[gram].add(script_id)
+
+    def _remove(self, script_id: int):
+        pattern = self._patterns.pop(script_id, None)
+        if pattern is None:
+            return
+        for gram in trigrams(pattern):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(script_id)
+                if not posting:
+                    del self._postings[gram]
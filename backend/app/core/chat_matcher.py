@@ -0,0 +1,195 @@
+from difflib import SequenceMatcher
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from ..config import settings
+from ..schemas.chat_schemas import ChatQuery, ChatResponse
+from .chat_index import CharCountMatrix, min_shared_trigrams
+from .script_cache import GLOBAL_SHARD, ScriptEntry, ScriptSnapshot, script_cache, shard_key
+
+class SequenceMatcherEngine:
+    """difflib ratio, exact over each shard.
+
+    Trigram candidates, the likely winners, are scored first. Every other
+    script is then either ruled out by its quick_ratio bound (see
+    CharCountMatrix) or scored, so the result is the same as scoring every
+    script. best_match is exact for scores that can still lead to an answer
+    (threshold minus CHAT_PAGE_BOOST and up); below that it may return a
+    lower score or no match.
+    """
+
+    name = "sequence"
+
+    def __init__(self):
+        self._version: Optional[int] = None
+        self._matrices: Dict[Optional[str], CharCountMatrix] = {}
+        self._lock = Lock()
+
+    @property
+    def threshold(self) -> float:
+        return settings.CHAT_SEQUENCE_THRESHOLD
+
+    def matrix(self, snapshot: ScriptSnapshot, shard: Optional[str] = None) -> CharCountMatrix:
+        """Character counts of one shard, or the whole snapshot when shard is None"""
+        with self._lock:
+            if self._version != snapshot.version:
+                self._matrices = {}
+                self._version = snapshot.version
+            matrix = self._matrices.get(shard)
+            if matrix is None:
+                entries = snapshot.entries if shard is None else snapshot.shards.get(shard, ())
+                matrix = self._matrices[shard] = CharCountMatrix([e.normalized for e in entries])
+            return matrix
+
+    def best_match(self, snapshot: ScriptSnapshot, question: str, shard: str) -> Tuple[Optional[ScriptEntry], float]:
+        question = question.lower()
+        entries = snapshot.shards.get(shard, ())
+        floor = self.threshold - settings.CHAT_PAGE_BOOST
+        best_match = None
+        best_score = 0.0
+
+        def consider(entry: ScriptEntry):
+            nonlocal best_match, best_score
+            score = SequenceMatcher(None, question, entry.normalized).ratio()
+            # Ties go to the lower id, as in a scan in id order
+            if score > best_score or (score == best_score and best_match is not None and entry.id < best_match.id):
+                best_match, best_score = entry, score
+
+        scored = set()
+        for entry in script_cache.candidates(snapshot, question, shard, min_shared_trigrams(question, self.threshold)):
+            consider(entry)
+            scored.add(entry.id)
+
+        bounds = self.matrix(snapshot, shard).bounds(question)
+        rows = np.flatnonzero(bounds >= max(best_score, floor))
+        for row in rows[np.argsort(-bounds[rows], kind="stable")]:
+            if bounds[row] < max(best_score, floor):
+                break
+            if entries[row].id not in scored:
+                consider(entries[row])
+        return best_match, best_score
+
+    def similar(self, snapshot: ScriptSnapshot, question: str, limit: int = 3) -> List[ScriptEntry]:
+        """The `limit` highest-scoring scripts of the whole snapshot, ties to the lower id"""
+        question = question.lower()
+        if limit <= 0:
+            return []
+        bounds = self.matrix(snapshot).bounds(question)
+        # Score in falling bound order; stop once no remaining bound can reach the current top `limit`
+        scored: List[Tuple[float, int, ScriptEntry]] = []
+        for row in np.argsort(-bounds, kind="stable"):
+            if len(scored) >= limit and bounds[row] < scored[limit - 1][0]:
+                break
+            entry = snapshot.entries[row]
+            scored.append((SequenceMatcher(None, question, entry.normalized).ratio(), entry.id, entry))
+            scored.sort(key=lambda x: (-x[0], x[1]))
+        return [entry for _, _, entry in scored[:limit]]
+
+@lru_cache()
+def get_matcher():
+    """Matcher engine selected by CHAT_MATCH_ENGINE"""
+    if settings.CHAT_MATCH_ENGINE == "tfidf":
+        from .tfidf_matcher import TfidfMatcherEngine
+        return TfidfMatcherEngine()
+    if settings.CHAT_MATCH_ENGINE == "sequence":
+        return SequenceMatcherEngine()
+    raise ValueError(f"Unknown CHAT_MATCH_ENGINE: {settings.CHAT_MATCH_ENGINE}")
+
+def best_in_shards(snapshot: ScriptSnapshot, question: str, page_shard: str) -> Tuple[Optional[ScriptEntry], float]:
+    """Best match in the page shard (boosted by CHAT_PAGE_BOOST) and the global shard"""
+    matcher = get_matcher()
+    best_match = None
+    best_score = 0.0
+    shards = [GLOBAL_SHARD] if page_shard == GLOBAL_SHARD else [page_shard, GLOBAL_SHARD]
+    for shard in shards:
+        entry, score = matcher.best_match(snapshot, question, shard)
+        if entry is not None and shard != GLOBAL_SHARD:
+            score = min(score + settings.CHAT_PAGE_BOOST, 1.0)
+        if score > best_score:
+            best_score = score
+            best_match = entry
+    return best_match, best_score
+
+def best_in_other_shards(snapshot: ScriptSnapshot, question: str, page_shard: str) -> Tuple[Optional[ScriptEntry], float]:
+    matcher = get_matcher()
+    best_match = None
+    best_score = 0.0
+    for shard in snapshot.shards:
+        if shard in (page_shard, GLOBAL_SHARD):
+            continue
+        entry, score = matcher.best_match(snapshot, question, shard)
+        if score > best_score:
+            best_score = score
+            best_match = entry
+    return best_match, best_score
+
+def best_overall(snapshot: ScriptSnapshot, question: str, page_shard: str,
+                 threshold: float) -> Tuple[Optional[ScriptEntry], float]:
+    """Best match in the page and global shards, then the rest if nothing clears the threshold"""
+    best_match, best_score = best_in_shards(snapshot, question, page_shard)
+    if best_score < threshold and settings.CHAT_SHARD_FALLBACK:
+        other_match, other_score = best_in_other_shards(snapshot, question, page_shard)
+        if other_score > best_score:
+            best_match, best_score = other_match, other_score
+    return best_match, best_score
+
+def normalize_query(query: ChatQuery) -> ChatQuery:
+    """The query as matched and cached: lowercased, whitespace collapsed.
+    Both use the same string, so a cached confidence is the one it would score."""
+    return ChatQuery(
+        question=" ".join(query.question.lower().split()),
+        session_id=query.session_id,
+        page_url=query.page_url
+    )
+
+def corrected_question(question: str) -> Optional[str]:
+    """Spell-corrected question, or None when correction is off or changes nothing"""
+    if not settings.CHAT_SPELL_CORRECTION:
+        return None
+    corrected = script_cache.vocabulary.correct(question)
+    return corrected if corrected != question else None
+
+def compute_response(snapshot: ScriptSnapshot, query: ChatQuery, corrected: Optional[str] = None) -> ChatResponse:
+    """Run the configured matcher engine for one query.
+
+    `corrected` is the spell-corrected question. It is only scored when the
+    question as typed does not clear the threshold, and only wins when it
+    scores higher, so correcting a real word into a vocabulary word
+    (boat -> goat) cannot displace a raw match.
+    """
+    threshold = get_matcher().threshold
+    page_shard = shard_key(query.page_url)
+
+    question = query.question
+    best_match, best_score = best_overall(snapshot, question, page_shard, threshold)
+    if corrected is not None and best_score < threshold:
+        corrected_match, corrected_score = best_overall(snapshot, corrected, page_shard, threshold)
+        if corrected_score > best_score:
+            question, best_match, best_score = corrected, corrected_match, corrected_score
+
+    # If good match found
+    if best_match and best_score >= threshold:
+        return ChatResponse(
+            answer=best_match.answer,
+            confidence=best_score,
+            source="database",
+            script_id=best_match.id,
+            suggestions=[]
+        )
+
+    # Return helpful fallback with suggestions
+    suggestions = get_similar_questions(snapshot, question, limit=3)
+
+    return ChatResponse(
+        answer="I'm not sure about that yet, but I'm learning! I've noted your question.",
+        confidence=0.0,
+        source="learning",
+        suggestions=suggestions
+    )
+
+def get_similar_questions(snapshot: ScriptSnapshot, question: str, limit: int = 3):
+    """Find similar questions for suggestions"""
+    entries = get_matcher().similar(snapshot, question, limit)
+    return [{"question": e.pattern, "id": e.id} for e in entries]
@@ -0,0 +1,94 @@
+import gzip
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+
+from ..config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip is offered
+    brotli = None
+
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best encoding we support from an Accept-Encoding header, preferring br on ties"""
+    if not accept_encoding:
+        return None
+    offered = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        offered[coding.strip().lower()] = q
+    best = None
+    for encoding in ENCODINGS:
+        q = offered.get(encoding, offered.get("*", 0.0))
+        if q > 0 and (best is None or q > best[1]):
+            best = (encoding, q)
+    return best[0] if best else None
+
+def compress(body: bytes, encoding: str, precompressed: bool = False) -> bytes:
+    """Encode body; precompressed variants are built once per content version, so use the top levels"""
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if precompressed else 5)
+    return gzip.compress(body, compresslevel=9 if precompressed else 6, mtime=0)
+
+class CompressionMiddleware:
+    """gzip/brotli for single-body responses the routes did not encode themselves.
+
+    Streaming responses (more than one body message) pass through untouched,
+    as do bodies under COMPRESSION_MIN_SIZE and non-text content types.
+    """
+
+    def __init__(self, app, minimum_size: int = settings.COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Held back until the first body message shows whether to compress
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            content_type = headers.get("content-type", "")
+            if (message.get("more_body", False) or "content-encoding" in headers
+                    or len(body) < self.minimum_size or not content_type.startswith(COMPRESSIBLE_TYPES)):
+                await send(start)
+                start = None
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            start = None
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
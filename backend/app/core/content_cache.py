@@ -0,0 +1,114 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from sqlalchemy import select
+
+from ..config import settings
+from ..models.content_version import ContentVersion
+from .ttl_cache import LRUTTLCache
+
+class ContentCache:
+    """Read-through cache for public site content (systems, social links, pages).
+
+    Entries live in one LRU+TTL cache per section. Admin writes call
+    `invalidate(section)`, which bumps the section version so its entries are
+    dropped on the next lookup. Concurrent misses for the same key share a
+    single load, and a load that started before an invalidation returns its
+    result to the callers waiting on it but is not stored.
+
+    Writes made by other worker processes are picked up by `refresh`, which
+    public endpoints await before reading: when the database content version
+    differs from the one last seen, every section is invalidated. It checks at
+    most every `check_interval` seconds; at 0 no worker serves content older
+    than the last committed write, so a proxy cache purged after the write
+    cannot re-cache stale content from another worker.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, check_interval: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.content_version: Optional[int] = None
+        self._checked_at = float("-inf")
+        self.loads = 0
+        self.coalesced = 0
+        self.versions: Counter = Counter()
+        self._sections: Dict[str, LRUTTLCache] = {}
+        self._inflight: Dict[Tuple[str, Hashable, int], asyncio.Future] = {}
+
+    async def get(self, section: str, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        """Cached value for `key`, calling `loader` on a miss; None results are not cached"""
+        version = self.versions[section]
+        cache = self._section(section)
+        value = cache.get(key, version)
+        if value is not None:
+            return value
+
+        flight = (section, key, version)
+        future = self._inflight.get(flight)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[flight] = future
+        self.loads += 1
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark it retrieved so an unshared failure is not reported twice
+            future.exception()
+            raise
+        finally:
+            del self._inflight[flight]
+
+        future.set_result(value)
+        if value is not None and self.versions[section] == version:
+            cache.set(key, value, version)
+        return value
+
+    async def refresh(self, db):
+        """Invalidate every section if the content version moved since the last check"""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        version = await db.scalar(select(ContentVersion.value)) or 0
+        if version != self.content_version:
+            if self.content_version is not None:
+                for section in list(self._sections):
+                    self.invalidate(section)
+            self.content_version = version
+
+    def invalidate(self, section: str):
+        self.versions[section] += 1
+        cache = self._sections.get(section)
+        if cache is not None:
+            cache.invalidate()
+
+    def stats(self) -> dict:
+        return {
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+            "sections": {
+                name: {"version": self.versions[name], **cache.stats()}
+                for name, cache in sorted(self._sections.items())
+            }
+        }
+
+    def _section(self, section: str) -> LRUTTLCache:
+        cache = self._sections.get(section)
+        if cache is None:
+            cache = self._sections[section] = LRUTTLCache(maxsize=self.maxsize, ttl=self.ttl)
+        return cache
+
+content_cache = ContentCache(
+    maxsize=settings.CONTENT_CACHE_SIZE,
+    ttl=settings.CONTENT_CACHE_TTL,
+    check_interval=settings.CONTENT_CACHE_CHECK_INTERVAL
+)
@@ -0,0 +1,74 @@
+import hashlib
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from ..config import settings
+from .compression import compress, negotiate
+from .surrogate_keys import SurrogateKey, surrogate_header
+
+class CachedContent(NamedTuple):
+    """A public payload, its final JSON bytes and their strong ETag, plus the
+    compressed variants of those bytes, filled in on first use"""
+    value: Any
+    body: bytes
+    etag: str
+    variants: Dict[str, bytes]
+
+    def encoded(self, encoding: str) -> bytes:
+        body = self.variants.get(encoding)
+        if body is None:
+            body = self.variants[encoding] = compress(self.body, encoding, precompressed=True)
+        return body
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def dump_json(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default)
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def cached_content(value: Any) -> CachedContent:
+    """Serialize once; the bytes are served as-is until the cache entry is invalidated"""
+    body = dump_json(value)
+    return CachedContent(value, body, make_etag(body), {})
+
+def variant_etag(etag: str, encoding: Optional[str]) -> str:
+    """Each encoding is its own representation, so it gets its own strong ETag"""
+    return etag if encoding is None else f'{etag[:-1]}-{encoding}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check against any encoding of this version, using the
+    weak comparison RFC 7232 requires for it"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    accepted = {etag} | {variant_etag(etag, encoding) for encoding in ("gzip", "br")}
+    return any(tag.strip().removeprefix("W/") in accepted for tag in header.split(","))
+
+def cache_headers(etag: str, surrogate_keys: Iterable[SurrogateKey] = ()) -> dict:
+    headers = {"ETag": etag, "Cache-Control": settings.PUBLIC_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if surrogate_keys:
+        headers["Surrogate-Key"] = surrogate_header(surrogate_keys)
+    return headers
+
+def conditional(request: Request, content: CachedContent, surrogate_keys: Iterable[SurrogateKey] = ()) -> Response:
+    """304 when the client already holds this version, else the pre-serialized
+    body, precompressed when the client accepts gzip or brotli"""
+    encoding = None
+    if len(content.body) >= settings.COMPRESSION_MIN_SIZE:
+        encoding = negotiate(request.headers.get("accept-encoding"))
+    headers = cache_headers(variant_etag(content.etag, encoding), surrogate_keys)
+    if etag_matches(request, content.etag):
+        return Response(status_code=304, headers=headers)
+    if encoding is None:
+        return Response(content=content.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = encoding
+    return Response(content=content.encoded(encoding), media_type="application/json", headers=headers)
@@ -0,0 +1,207 @@
+"""On-disk, memory-mappable artifact of the chat matcher snapshot.
+
+The file holds the approved script entries and a global trigram inverted
+index as flat little-endian arrays behind a small JSON header. Workers map it
+read-only and use it in place of building the trigram indexes at boot. Only
+the trigram postings are served from the mapping, so those pages are shared
+between every uvicorn worker on the host; the patterns and answers are
+decoded into each worker's own snapshot on load, since every match reads
+them. The artifact is keyed to a content hash of the matchable chat_scripts
+columns; when the hash no longer matches the table the caller rebuilds from
+the database and writes a fresh artifact.
+"""
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from ..models.chat_models import ChatScript
+from .chat_index import trigrams
+from .script_cache import ScriptEntry, make_entry
+
+MAGIC = b"PPCHATIX"
+FORMAT_VERSION = 1
+ALIGN = 8
+
+def table_content_hash(db: Session) -> str:
+    """Hash of the id, pattern, answer and page_context of every approved script.
+
+    PostgreSQL computes it server-side so checking a snapshot moves no rows;
+    other databases stream the columns through sha256.
+    """
+    approved = ChatScript.requires_approval == False
+    if db.bind.dialect.name == "postgresql":
+        row_hash = func.md5(
+            func.concat_ws("|", ChatScript.id, ChatScript.question_pattern, ChatScript.answer,
+                           func.coalesce(ChatScript.page_context, ""))
+        )
+        digest = db.execute(
+            select(func.md5(func.coalesce(func.string_agg(row_hash, aggregate_order_by(literal(","), ChatScript.id)), "")))
+            .where(approved)
+        ).scalar()
+        return f"md5:{digest}"
+
+    digest = hashlib.sha256()
+    rows = db.query(
+        ChatScript.id, ChatScript.question_pattern, ChatScript.answer, ChatScript.page_context
+    ).filter(approved).order_by(ChatScript.id).yield_per(10000)
+    for script_id, pattern, answer, page_context in rows:
+        digest.update(f"{script_id}|{pattern}|{answer}|{page_context or ''}\n".encode("utf-8"))
+    return f"sha256:{digest.hexdigest()}"
+
+def trigram_code(gram: str) -> int:
+    """Pack a trigram into one integer, 21 bits per code point"""
+    return (ord(gram[0]) << 42) | (ord(gram[1]) << 21) | ord(gram[2])
+
+class MappedIndex:
+    """Read-only view of an index artifact"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a chat index artifact")
+        header_len = int.from_bytes(self._mm[len(MAGIC):len(MAGIC) + 4], "little")
+        start = len(MAGIC) + 4
+        self.header = json.loads(self._mm[start:start + header_len].decode("utf-8"))
+        if self.header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{path} has unsupported format {self.header.get('format')}")
+        self.content_hash: str = self.header["content_hash"]
+        self.shard_names: List[str] = self.header["shards"]
+        self._shard_ids: Dict[str, int] = {name: i for i, name in enumerate(self.shard_names)}
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.frombuffer(self._mm, dtype=np.dtype(dtype), count=count, offset=offset)
+            for name, (dtype, count, offset) in self.header["arrays"].items()
+        }
+
+    def entries(self) -> Iterator[ScriptEntry]:
+        """Entries in row (= id) order, decoded from the blob into new strings"""
+        ids = self.arrays["ids"].tolist()
+        shards = self.arrays["shards"].tolist()
+        pattern_offsets = self.arrays["pattern_offsets"].tolist()
+        answer_offsets = self.arrays["answer_offsets"].tolist()
+        blob = self.arrays["blob"]
+        for row, script_id in enumerate(ids):
+            pattern = blob[pattern_offsets[row]:pattern_offsets[row + 1]].tobytes().decode("utf-8")
+            answer = blob[answer_offsets[row]:answer_offsets[row + 1]].tobytes().decode("utf-8")
+            yield make_entry(script_id, pattern, answer, self.shard_names[shards[row]])
+
+    def candidate_rows(self, question: str, shard: str, min_shared: int = 1,
+                       limit: Optional[int] = None) -> np.ndarray:
+        """Sorted entry rows in `shard` sharing `min_shared` or more trigrams
+        with the question, at most `limit` of them by overlap"""
+        shard_id = self._shard_ids.get(shard)
+        keys = self.arrays["trigram_keys"]
+        if shard_id is None or not len(keys):
+            return np.empty(0, dtype=np.int32)
+        codes = np.array(sorted(trigram_code(g) for g in trigrams(question)), dtype=np.uint64)
+        pos = np.searchsorted(keys, codes)
+        found = pos < len(keys)
+        found[found] = keys[pos[found]] == codes[found]
+        offsets = self.arrays["trigram_offsets"]
+        postings = self.arrays["trigram_postings"]
+        rows = [postings[offsets[p]:offsets[p + 1]] for p in pos[found]]
+        if not rows:
+            return np.empty(0, dtype=np.int32)
+        rows, shared = np.unique(np.concatenate(rows), return_counts=True)
+        keep = (self.arrays["shards"][rows] == shard_id) & (shared >= min_shared)
+        rows, shared = rows[keep], shared[keep]
+        if limit is not None and len(rows) > limit:
+            # Largest overlap first, ties to the lower row (= lower id, rows are in id order)
+            rows = np.sort(rows[np.lexsort((rows, -shared))[:limit]])
+        return rows
+
+    def close(self):
+        self.arrays = {}
+        try:
+            self._mm.close()
+        except BufferError:
+            # Views handed out to readers keep the mapping alive until they are collected
+            pass
+
+def write_artifact(path: str, entries: List[ScriptEntry], content_hash: str):
+    """Serialize entries (sorted by id) and their trigram index, replacing `path` atomically"""
+    shard_names = sorted({e.shard for e in entries})
+    shard_ids = {name: i for i, name in enumerate(shard_names)}
+
+    pattern_bytes = [e.pattern.encode("utf-8") for e in entries]
+    answer_bytes = [e.answer.encode("utf-8") for e in entries]
+    # One running offset over every pattern then every answer, so the answers
+    # start exactly where the last pattern ends
+    offsets = np.zeros(2 * len(entries) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in pattern_bytes + answer_bytes])
+    pattern_offsets = offsets[:len(entries) + 1]
+    answer_offsets = offsets[len(entries):]
+    blob = np.frombuffer(b"".join(pattern_bytes) + b"".join(answer_bytes), dtype=np.uint8)
+
+    postings: Dict[int, List[int]] = {}
+    for row, e in enumerate(entries):
+        for gram in trigrams(e.normalized):
+            postings.setdefault(trigram_code(gram), []).append(row)
+    keys = np.array(sorted(postings), dtype=np.uint64)
+    trigram_offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    trigram_offsets[1:] = np.cumsum([len(postings[int(k)]) for k in keys])
+    trigram_postings = np.fromiter(
+        (row for k in keys for row in postings[int(k)]), dtype=np.int32, count=int(trigram_offsets[-1])
+    )
+
+    arrays = {
+        "ids": np.array([e.id for e in entries], dtype=np.int64),
+        "shards": np.array([shard_ids[e.shard] for e in entries], dtype=np.int32),
+        "pattern_offsets": pattern_offsets,
+        "answer_offsets": answer_offsets,
+        "blob": blob,
+        "trigram_keys": keys,
+        "trigram_offsets": trigram_offsets,
+        "trigram_postings": trigram_postings,
+    }
+
+    # Array offsets depend on the header length, so size the header with placeholders first
+    layout: Dict[str, Tuple[str, int, int]] = {name: (a.dtype.str, len(a), 0) for name, a in arrays.items()}
+    header = {"format": FORMAT_VERSION, "content_hash": content_hash, "shards": shard_names,
+              "count": len(entries), "arrays": layout}
+    header_len = len(json.dumps(header).encode("utf-8")) + 32 * len(arrays)
+    position = _align(len(MAGIC) + 4 + header_len)
+    for name, a in arrays.items():
+        layout[name] = (a.dtype.str, len(a), position)
+        position = _align(position + a.nbytes)
+    header_bytes = json.dumps(header).encode("utf-8").ljust(header_len)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".chat-index-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header_bytes).to_bytes(4, "little"))
+            f.write(header_bytes)
+            for name, a in arrays.items():
+                f.seek(layout[name][2])
+                f.write(a.tobytes())
+            f.truncate(position)
+        # mkstemp creates the file 0600; other workers and users must be able to map it
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def open_artifact(path: str) -> Optional[MappedIndex]:
+    """Map the artifact at `path`, or None if it is missing or unreadable"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return MappedIndex(path)
+    except (ValueError, OSError, KeyError, json.JSONDecodeError):
+        return None
+
+def _align(position: int) -> int:
+    return (position + ALIGN - 1) // ALIGN * ALIGN
@@ -0,0 +1,261 @@
+import time
+from collections import Counter
+from threading import Lock
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.chat_models import ChatScript, PageContext
+from ..models.content_version import current_change_version
+from .chat_index import TrigramIndex
+from .spell_correct import SymSpell
+
+GLOBAL_SHARD = "global"
+
+def shard_key(page: Optional[str]) -> str:
+    """Shard name for a script page_context or a query page_url: its URL path"""
+    if not page or page == GLOBAL_SHARD:
+        return GLOBAL_SHARD
+    path = urlparse(page).path or "/"
+    return path.rstrip("/") or "/"
+
+class ScriptEntry(NamedTuple):
+    id: int
+    pattern: str
+    normalized: str
+    answer: str
+    shard: str
+
+class ScriptSnapshot:
+    """Immutable view of the matchable (approved) chat scripts at one version,
+    partitioned into shards by page context"""
+
+    __slots__ = ("version", "entries", "by_id", "shards")
+
+    def __init__(self, version: int, entries: Iterable[ScriptEntry]):
+        self.version = version
+        self.entries: Tuple[ScriptEntry, ...] = tuple(sorted(entries, key=lambda e: e.id))
+        self.by_id: Mapping[int, ScriptEntry] = MappingProxyType({e.id: e for e in self.entries})
+        shards: Dict[str, List[ScriptEntry]] = {}
+        for e in self.entries:
+            shards.setdefault(e.shard, []).append(e)
+        self.shards: Mapping[str, Tuple[ScriptEntry, ...]] = MappingProxyType(
+            {name: tuple(members) for name, members in shards.items()}
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __reduce__(self):
+        return (ScriptSnapshot, (self.version, self.entries))
+
+def make_entry(script_id: int, pattern: str, answer: str, page_context: Optional[str]) -> ScriptEntry:
+    return ScriptEntry(script_id, pattern, pattern.lower(), answer, shard_key(page_context))
+
+class ScriptCache:
+    """Process-wide snapshot of matchable scripts plus a trigram index per
+    shard and the spelling vocabulary built from script patterns and page
+    key topics.
+
+    Readers take `snapshot` once and work on that immutable object; admin
+    writes swap in a new snapshot and bump `version`. Writes made by other
+    worker processes are picked up by `load`, which compares the database
+    content version with the one the snapshot was built at every
+    CHAT_SNAPSHOT_CHECK_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        self.snapshot: Optional[ScriptSnapshot] = None
+        self.indexes: Dict[str, TrigramIndex] = {}
+        self.vocabulary = SymSpell(max_distance=settings.CHAT_SPELL_MAX_DISTANCE)
+        # Set while the trigram index is served from a mapped on-disk artifact
+        self.mapped = None
+        self._mapped_version: Optional[int] = None
+        self.shard_queries: Counter = Counter()
+        self.shard_hits: Counter = Counter()
+        self._lock = Lock()
+        self._version = 0
+        self._content_version: Optional[int] = None
+        self._checked_at = 0.0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def load(self, db: Session) -> ScriptSnapshot:
+        """Current snapshot, building it from the database on first use or
+        when another worker has changed the scripts since it was built"""
+        snapshot = self.snapshot
+        if snapshot is not None and self._stale(db):
+            snapshot = None
+        if snapshot is None:
+            if settings.CHAT_INDEX_SNAPSHOT_PATH:
+                snapshot = self.load_artifact(db, settings.CHAT_INDEX_SNAPSHOT_PATH)
+            else:
+                snapshot = self.rebuild(db)
+        return snapshot
+
+    def load_artifact(self, db: Session, path: str) -> ScriptSnapshot:
+        """Map the on-disk index at `path` if it matches the table, else rebuild and rewrite it"""
+        from .index_snapshot import open_artifact, table_content_hash, write_artifact
+
+        content_version = current_change_version(db)
+        content_hash = table_content_hash(db)
+        mapped = open_artifact(path)
+        if mapped is not None and mapped.content_hash == content_hash:
+            topics = self._page_topics(db)
+            with self._lock:
+                snapshot = self._adopt_mapped(mapped, mapped.entries())
+                self.vocabulary.rebuild([(("script", e.id), e.pattern) for e in snapshot.entries] + topics)
+                self._mark_built(content_version)
+                return snapshot
+        if mapped is not None:
+            mapped.close()
+
+        snapshot = self.rebuild(db)
+        write_artifact(path, list(snapshot.entries), content_hash)
+        return snapshot
+
+    def rebuild(self, db: Session) -> ScriptSnapshot:
+        # Read before the rows: a write landing in between only costs one more rebuild
+        content_version = current_change_version(db)
+        rows = db.query(
+            ChatScript.id, ChatScript.question_pattern, ChatScript.answer, ChatScript.page_context
+        ).filter(ChatScript.requires_approval == False).all()
+        entries = [make_entry(*row) for row in rows]
+        topics = self._page_topics(db)
+        with self._lock:
+            self._rebuild_indexes(entries)
+            self.vocabulary.rebuild([(("script", e.id), e.pattern) for e in entries] + topics)
+            self._mark_built(content_version)
+            return self._publish(entries)
+
+    def install_mapped(self, mapped) -> ScriptSnapshot:
+        """Serve the entries and trigram index of an artifact written
+        elsewhere, e.g. by the parent of a matcher worker process"""
+        with self._lock:
+            previous = self.mapped
+            snapshot = self._adopt_mapped(mapped, mapped.entries())
+        if previous is not None:
+            previous.close()
+        return snapshot
+
+    def sync(self, script: ChatScript):
+        """Patch the snapshot with a committed script write"""
+        if self.snapshot is None:
+            return
+        if script.requires_approval is False:
+            self.upsert(make_entry(script.id, script.question_pattern, script.answer, script.page_context))
+        else:
+            self.remove(script.id)
+
+    def sync_page_context(self, context: PageContext):
+        """Refresh the spelling vocabulary with a committed page context write"""
+        if self.snapshot is None:
+            return
+        self.vocabulary.set_source(("page", context.page_route), " ".join(context.key_topics or []))
+
+    def upsert(self, entry: ScriptEntry):
+        with self._lock:
+            self._ensure_mutable()
+            previous = self.snapshot.by_id.get(entry.id)
+            if previous is not None and previous.shard != entry.shard:
+                self.indexes[previous.shard].remove(entry.id)
+            entries = [e for e in self.snapshot.entries if e.id != entry.id]
+            entries.append(entry)
+            self.indexes.setdefault(entry.shard, TrigramIndex()).add(entry.id, entry.normalized)
+            self.vocabulary.set_source(("script", entry.id), entry.pattern)
+            self._publish(entries)
+
+    def remove(self, script_id: int):
+        with self._lock:
+            self._ensure_mutable()
+            previous = self.snapshot.by_id.get(script_id)
+            if previous is None:
+                return
+            self.indexes[previous.shard].remove(script_id)
+            self.vocabulary.remove_source(("script", script_id))
+            self._publish(e for e in self.snapshot.entries if e.id != script_id)
+
+    def candidates(self, snapshot: ScriptSnapshot, question: str, shard: str,
+                   min_shared: int = 1) -> List[ScriptEntry]:
+        """Entries of one shard with the most trigram overlap with the question
+        (at least `min_shared`, at most CHAT_CANDIDATE_LIMIT), in id order"""
+        limit = settings.CHAT_CANDIDATE_LIMIT or None
+        mapped = self.mapped
+        if mapped is not None and snapshot.version == self._mapped_version:
+            return [snapshot.entries[row] for row in mapped.candidate_rows(question, shard, min_shared, limit)]
+        index = self.indexes.get(shard)
+        if index is None:
+            return []
+        return [
+            snapshot.by_id[script_id]
+            for script_id, _ in index.candidates(question, min_shared, limit)
+            if script_id in snapshot.by_id
+        ]
+
+    def record_query(self, page_shard: str, hit: Optional[ScriptEntry]):
+        """Count a query routed to `page_shard` and the shard that answered it"""
+        self.shard_queries[page_shard] += 1
+        if page_shard != GLOBAL_SHARD:
+            self.shard_queries[GLOBAL_SHARD] += 1
+        if hit is not None:
+            self.shard_hits[hit.shard] += 1
+
+    def shard_stats(self) -> List[dict]:
+        shards = self.snapshot.shards if self.snapshot is not None else {}
+        return [{
+            "shard": name,
+            "size": len(shards.get(name, ())),
+            "queries": self.shard_queries[name],
+            "hits": self.shard_hits[name],
+            "hit_rate": self.shard_hits[name] / self.shard_queries[name] if self.shard_queries[name] > 0 else 0
+        } for name in sorted(set(shards) | set(self.shard_queries) | set(self.shard_hits))]
+
+    @staticmethod
+    def _page_topics(db: Session) -> List[tuple]:
+        rows = db.query(PageContext.page_route, PageContext.key_topics).all()
+        return [(("page", route), " ".join(key_topics or [])) for route, key_topics in rows]
+
+    def _stale(self, db: Session) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at < settings.CHAT_SNAPSHOT_CHECK_INTERVAL:
+            return False
+        self._checked_at = now
+        return current_change_version(db) != self._content_version
+
+    def _mark_built(self, content_version: int):
+        self._content_version = content_version
+        self._checked_at = time.monotonic()
+
+    def _adopt_mapped(self, mapped, entries: Iterable[ScriptEntry]) -> ScriptSnapshot:
+        self.indexes = {}
+        self.mapped = mapped
+        self._mapped_version = self._version + 1
+        return self._publish(entries)
+
+    def _ensure_mutable(self):
+        """Swap a mapped trigram index for in-memory ones before patching"""
+        if self.mapped is not None:
+            self._rebuild_indexes(self.snapshot.entries)
+
+    def _rebuild_indexes(self, entries: Iterable[ScriptEntry]):
+        grouped: Dict[str, List[ScriptEntry]] = {}
+        for e in entries:
+            grouped.setdefault(e.shard, []).append(e)
+        indexes = {}
+        for name, members in grouped.items():
+            indexes[name] = TrigramIndex()
+            indexes[name].rebuild((e.id, e.normalized) for e in members)
+        self.indexes = indexes
+        self.mapped = None
+        self._mapped_version = None
+
+    def _publish(self, entries: Iterable[ScriptEntry]) -> ScriptSnapshot:
+        self._version += 1
+        self.snapshot = ScriptSnapshot(self._version, entries)
+        return self.snapshot
+
+script_cache = ScriptCache()
@@ -0,0 +1,153 @@
+"""Full-text search over systems, pages and chat scripts.
+
+SQLite keeps a shared FTS5 table, `search_index`, maintained by triggers on
+the three source tables. Only visible rows are indexed: active systems,
+published pages and approved scripts. Each row's rowid packs the source id
+and type, so triggers touch a single index row. PostgreSQL keeps a generated
+`search_vector` tsvector column with a GIN index on each table instead, and
+filters visibility at query time.
+
+The DDL is idempotent. The `add_search_index` migration and startup (for
+databases created with `create_all`) both run `ensure_search_index`.
+"""
+import re
+from typing import List, NamedTuple, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+TYPE_CODES = 4
+
+class Source(NamedTuple):
+    entity: str
+    code: int  # rowid type code
+    table: str
+    title: str
+    body: str
+    key: Optional[str]
+    flag: str  # column deciding visibility
+    visible: str  # visibility condition, {row} is the row prefix
+
+    def columns(self, row: str = "") -> str:
+        key = f"{row}{self.key}" if self.key else "NULL"
+        return f"{row}id * {TYPE_CODES} + {self.code}, '{self.entity}', {row}id, {key}, {row}{self.title}, {row}{self.body}"
+
+SOURCES = (
+    Source("system", 1, "systems", "title", "description", "slug", "is_active", "{row}is_active"),
+    Source("page", 2, "pages", "title", "content", "name", "is_published", "{row}is_published"),
+    Source("script", 3, "chat_scripts", "question_pattern", "answer", None, "requires_approval",
+           "NOT {row}requires_approval"),
+)
+
+def _sqlite_ddl() -> List[str]:
+    statements = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+        "entity_type UNINDEXED, entity_id UNINDEXED, key UNINDEXED, title, body, "
+        "tokenize = 'porter unicode61')"
+    ]
+    for source in SOURCES:
+        table = source.table
+        insert = (
+            f"INSERT INTO search_index(rowid, entity_type, entity_id, key, title, body) "
+            f"SELECT {source.columns('new.')} WHERE {source.visible.format(row='new.')};"
+        )
+        delete = f"DELETE FROM search_index WHERE rowid = old.id * {TYPE_CODES} + {source.code};"
+        watched = ", ".join(c for c in (source.title, source.body, source.key, source.flag) if c)
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} BEGIN {delete} END",
+            # Only the indexed columns, so usage_count bumps and the like leave the index alone
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF {watched} ON {table} "
+            f"BEGIN {delete} {insert} END",
+        ]
+    return statements
+
+def _sqlite_backfill() -> List[str]:
+    return [
+        f"INSERT INTO search_index(rowid, entity_type, entity_id, key, title, body) "
+        f"SELECT {source.columns()} FROM {source.table} WHERE {source.visible.format(row='')}"
+        for source in SOURCES
+    ]
+
+def _postgres_ddl() -> List[str]:
+    statements = []
+    for source in SOURCES:
+        statements += [
+            f"ALTER TABLE {source.table} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+            f"setweight(to_tsvector('english', coalesce({source.title}, '')), 'A') || "
+            f"setweight(to_tsvector('english', coalesce({source.body}, '')), 'B')) STORED",
+            f"CREATE INDEX IF NOT EXISTS ix_{source.table}_search_vector ON {source.table} USING GIN (search_vector)",
+        ]
+    return statements
+
+def ensure_search_index(connection: Connection):
+    """Create the search index, triggers and backfill if they are missing"""
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        for statement in _postgres_ddl():
+            connection.execute(text(statement))
+    elif dialect == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'")
+        ).first()
+        for statement in _sqlite_ddl():
+            connection.execute(text(statement))
+        if not exists:
+            for statement in _sqlite_backfill():
+                connection.execute(text(statement))
+
+def drop_search_index(connection: Connection):
+    if connection.dialect.name == "postgresql":
+        for source in SOURCES:
+            connection.execute(text(f"DROP INDEX IF EXISTS ix_{source.table}_search_vector"))
+            connection.execute(text(f"ALTER TABLE {source.table} DROP COLUMN IF EXISTS search_vector"))
+    elif connection.dialect.name == "sqlite":
+        for source in SOURCES:
+            for suffix in ("insert", "delete", "update"):
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {source.table}_search_{suffix}"))
+        connection.execute(text("DROP TABLE IF EXISTS search_index"))
+
+def fts5_query(q: str) -> str:
+    """Quote each word so user input cannot inject FTS5 syntax; the last word matches as a prefix"""
+    words = re.findall(r"\w+", q)
+    if not words:
+        return ""
+    return " ".join(f'"{w}"' for w in words) + "*"
+
+def search(db: Session, q: str, limit: int, offset: int) -> Tuple[int, List[dict]]:
+    """(total hits, one page of hits ranked best first)"""
+    if db.bind.dialect.name == "postgresql":
+        return _search_postgres(db, q, limit, offset)
+    return _search_sqlite(db, q, limit, offset)
+
+def _search_sqlite(db: Session, q: str, limit: int, offset: int) -> Tuple[int, List[dict]]:
+    match = fts5_query(q)
+    if not match:
+        return 0, []
+    total = db.execute(text("SELECT count(*) FROM search_index WHERE search_index MATCH :match"),
+                       {"match": match}).scalar()
+    rows = db.execute(text(
+        "SELECT entity_type, entity_id, key, title, "
+        "snippet(search_index, 4, '<mark>', '</mark>', '…', 16) AS snippet, "
+        "-bm25(search_index, 0, 0, 0, 10.0, 1.0) AS score "
+        "FROM search_index WHERE search_index MATCH :match "
+        "ORDER BY score DESC, rowid LIMIT :limit OFFSET :offset"
+    ), {"match": match, "limit": limit, "offset": offset}).mappings().all()
+    return total, [dict(row) for row in rows]
+
+def _search_postgres(db: Session, q: str, limit: int, offset: int) -> Tuple[int, List[dict]]:
+    hits = " UNION ALL ".join(
+        f"SELECT '{source.entity}' AS entity_type, id AS entity_id, {source.key or 'NULL'}::text AS key, "
+        f"{source.title} AS title, {source.body} AS body, ts_rank(search_vector, query) AS score "
+        f"FROM {source.table}, websearch_to_tsquery('english', :q) AS query "
+        f"WHERE search_vector @@ query AND {source.visible.format(row='')}"
+        for source in SOURCES
+    )
+    total = db.execute(text(f"SELECT count(*) FROM ({hits}) AS hits"), {"q": q}).scalar()
+    rows = db.execute(text(
+        f"SELECT entity_type, entity_id, key, title, "
+        f"ts_headline('english', body, websearch_to_tsquery('english', :q), "
+        f"'StartSel=<mark>, StopSel=</mark>, MaxWords=16, MinWords=8') AS snippet, score "
+        f"FROM ({hits}) AS hits ORDER BY score DESC, entity_type, entity_id LIMIT :limit OFFSET :offset"
+    ), {"q": q, "limit": limit, "offset": offset}).mappings().all()
+    return total, [dict(row) for row in rows]
@@ -0,0 +1,128 @@
+import re
+from collections import Counter, defaultdict
+from threading import Lock
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+
+def tokenize(text: str) -> List[str]:
+    return [t.lower() for t in TOKEN_RE.findall(text)]
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance, or max_distance + 1 once it is exceeded"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > max_distance:
+            return max_distance + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+def deletes(word: str, max_distance: int) -> Set[str]:
+    """The word plus every string reachable by deleting up to max_distance characters"""
+    result = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        result |= frontier
+    return result
+
+class SymSpell:
+    """Symmetric-delete spelling corrector over a vocabulary of named sources.
+
+    Each source (a chat script, a page context) contributes its tokens; the
+    index is updated incrementally as sources are set or removed. Lookups only
+    compare the query token against words sharing a delete variant with it, so
+    correction cost does not grow with a linear scan of the vocabulary.
+    Words longer than `max_length` are neither indexed nor corrected: the
+    number of delete variants grows with length ** max_distance.
+    """
+
+    def __init__(self, max_distance: int = 2, min_length: int = 3, max_length: int = 24):
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.max_length = max_length
+        self._counts: Counter = Counter()
+        self._deletes: Dict[str, Set[str]] = defaultdict(set)
+        self._sources: Dict[Hashable, List[str]] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def rebuild(self, sources: Iterable[tuple]):
+        """Replace the vocabulary with the given (key, text) sources"""
+        with self._lock:
+            self._counts = Counter()
+            self._deletes = defaultdict(set)
+            self._sources = {}
+            for key, text in sources:
+                self._set(key, text)
+
+    def set_source(self, key: Hashable, text: str):
+        with self._lock:
+            self._remove(key)
+            self._set(key, text)
+
+    def remove_source(self, key: Hashable):
+        with self._lock:
+            self._remove(key)
+
+    def lookup(self, word: str) -> str:
+        """Closest vocabulary word within the edit budget, or the word itself"""
+        if not self.min_length <= len(word) <= self.max_length or word in self._counts or not word.isalpha():
+            return word
+        max_distance = 1 if len(word) <= 4 else self.max_distance
+        best: Optional[tuple] = None
+        with self._lock:
+            for variant in deletes(word, max_distance):
+                for candidate in self._deletes.get(variant, ()):
+                    distance = edit_distance(word, candidate, max_distance)
+                    if distance > max_distance:
+                        continue
+                    rank = (distance, -self._counts[candidate], candidate)
+                    if best is None or rank < best:
+                        best = rank
+        return word if best is None else best[2]
+
+    def correct(self, text: str) -> str:
+        """Replace misspelled tokens, leaving punctuation and spacing in place"""
+        def fix(match):
+            token = match.group(0)
+            corrected = self.lookup(token.lower())
+            return token if corrected == token.lower() else corrected
+        return TOKEN_RE.sub(fix, text)
+
+    def _set(self, key: Hashable, text: str):
+        words = tokenize(text)
+        self._sources[key] = words
+        for word in words:
+            if self._counts[word] == 0 and len(word) <= self.max_length:
+                for variant in deletes(word, self.max_distance):
+                    self._deletes[variant].add(word)
+            self._counts[word] += 1
+
+    def _remove(self, key: Hashable):
+        words = self._sources.pop(key, None)
+        if words is None:
+            return
+        for word in words:
+            self._counts[word] -= 1
+            if self._counts[word] <= 0:
+                del self._counts[word]
+                if len(word) > self.max_length:
+                    continue
+                for variant in deletes(word, self.max_distance):
+                    bucket = self._deletes.get(variant)
+                    if bucket is not None:
+                        bucket.discard(word)
+                        if not bucket:
+                            del self._deletes[variant]
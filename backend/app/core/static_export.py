@@ -0,0 +1,184 @@
+"""Static export of the public API payloads.
+
+Renders the same bytes the live endpoints serve to files laid out by URL,
+so nginx can answer them without touching the backend:
+
+    /api/systems/         -> api/systems/index.json
+    /api/systems/{slug}   -> api/systems/{slug}.json
+    /api/social/          -> api/social/index.json
+    /api/pages/{name}     -> api/pages/{name}.json
+
+Each file gets `.gz` and `.br` siblings for nginx's gzip_static/brotli_static.
+`manifest.json` maps every URL to its file, ETag and sizes, plus the content
+change version the export was rendered at. Files whose ETag matches the
+previous manifest are left alone and files for content that is gone are
+removed, so re-running an export only touches what changed.
+"""
+import asyncio
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from typing import Dict, Optional
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.database import SessionLocal
+from ..models.content_version import ContentVersion
+from ..models.page import Page
+from ..models.social import SocialLink
+from ..models.system import System
+from ..schemas.page import PageInDB
+from ..schemas.social import SocialLinkInDB
+from ..schemas.system import SystemInDB
+from .change_feed import change_feed
+from .compression import ENCODINGS, compress
+from .http_cache import dump_json, make_etag
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+SUFFIXES = {"gzip": ".gz", "br": ".br"}
+# Slugs and page names outside this are left to the backend rather than mapped to paths
+SAFE_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+
+def render_payloads(db: Session) -> Dict[str, bytes]:
+    """URL -> response body for every public GET"""
+    systems = db.execute(select(System).where(System.is_active == True).order_by(System.order)).scalars().all()
+    links = db.execute(
+        select(SocialLink).where(SocialLink.is_active == True).order_by(SocialLink.order)
+    ).scalars().all()
+    pages = db.execute(select(Page).where(Page.is_published == True)).scalars().all()
+
+    payloads = {
+        "/api/systems/": dump_json([SystemInDB.model_validate(s) for s in systems]),
+        "/api/social/": dump_json([SocialLinkInDB.model_validate(link) for link in links])
+    }
+    for system in systems:
+        if SAFE_NAME.match(system.slug):
+            payloads[f"/api/systems/{system.slug}"] = dump_json(SystemInDB.model_validate(system))
+    for page in pages:
+        if SAFE_NAME.match(page.name):
+            payloads[f"/api/pages/{page.name}"] = dump_json(PageInDB.model_validate(page))
+    return payloads
+
+def file_path(url: str) -> str:
+    path = url.lstrip("/")
+    return path + "index.json" if path.endswith("/") else path + ".json"
+
+def _write(path: str, data: bytes):
+    # Readers see either the old file or the new one, never a partial write
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(data)
+    os.replace(temp, path)
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _read_manifest(directory: str) -> dict:
+    try:
+        with open(os.path.join(directory, MANIFEST), "rb") as f:
+            return orjson.loads(f.read()).get("files", {})
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def export_static(db: Session, directory: str) -> dict:
+    """Write changed payloads and their compressed variants, drop stale ones, rewrite the manifest"""
+    # Read the version first, as /api/sync does: the files are at least this new
+    version = db.scalar(select(ContentVersion.value)) or 0
+    payloads = render_payloads(db)
+    previous = _read_manifest(directory)
+    files = {}
+    written = unchanged = 0
+
+    for url, body in payloads.items():
+        path = file_path(url)
+        etag = make_etag(body)
+        old = previous.get(url)
+        if old and old["etag"] == etag and all(
+            os.path.exists(os.path.join(directory, variant))
+            for variant in [path] + [path + SUFFIXES[encoding] for encoding in ENCODINGS]
+        ):
+            files[url] = old
+            unchanged += 1
+            continue
+
+        entry = {"path": path, "etag": etag, "size": len(body)}
+        _write(os.path.join(directory, path), body)
+        for encoding in ENCODINGS:
+            encoded = compress(body, encoding, precompressed=True)
+            _write(os.path.join(directory, path + SUFFIXES[encoding]), encoded)
+            entry[f"{encoding}_size"] = len(encoded)
+        files[url] = entry
+        written += 1
+
+    removed = 0
+    for url, old in previous.items():
+        if url not in files:
+            for suffix in ("", *SUFFIXES.values()):
+                _remove(os.path.join(directory, old["path"] + suffix))
+            removed += 1
+
+    _write(os.path.join(directory, MANIFEST), orjson.dumps({
+        "version": version,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "files": files
+    }, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+    return {"version": version, "written": written, "unchanged": unchanged, "removed": removed}
+
+class StaticExportHook:
+    """Keeps a static export current after admin writes.
+
+    Follows the change feed, waits `delay` seconds so a batch of writes
+    becomes a single export, then runs `export_static` in a worker thread.
+    The feed reports writes made by every worker, so each worker re-exports;
+    only payloads whose bytes changed are rewritten. Started from the app
+    lifespan when STATIC_EXPORT_ON_WRITE is set.
+    """
+
+    def __init__(self, directory: str, delay: float):
+        self.directory = directory
+        self.delay = delay
+        self.exports = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def export(self) -> dict:
+        db = SessionLocal()
+        try:
+            return export_static(db, self.directory)
+        finally:
+            db.close()
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        with change_feed.subscribe() as queue:
+            while True:
+                await queue.get()
+                await asyncio.sleep(self.delay)
+                while not queue.empty():
+                    queue.get_nowait()
+                try:
+                    await asyncio.to_thread(self.export)
+                    self.exports += 1
+                except Exception:
+                    logger.exception("Failed to re-export static payloads to %s", self.directory)
+
+static_export_hook = StaticExportHook(directory=settings.STATIC_EXPORT_DIR, delay=settings.STATIC_EXPORT_DELAY)
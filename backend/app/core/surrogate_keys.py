@@ -0,0 +1,68 @@
+"""Surrogate keys for public content and purging of the nginx proxy cache.
+
+Public responses carry a `Surrogate-Key` header naming the content in them
+(`systems:list`, `system:<id>`, `social:list`, `page:<name>`). Admin writes
+call `cache_purger.purge(...)` with the keys they touched. nginx's
+proxy_cache is keyed by URL, so each key also names the URL it is served at,
+and the purger sends one PURGE per URL to CACHE_PURGE_URL (see
+`nginx.proxy-cache.conf`). Purges are awaited before the write returns,
+so a page reloaded after saving never comes from the stale cache entry.
+"""
+import asyncio
+import logging
+from typing import Iterable, NamedTuple
+from urllib.parse import quote
+import httpx
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+class SurrogateKey(NamedTuple):
+    key: str
+    url: str  # public URL whose cached response this key tags
+
+def systems_list() -> SurrogateKey:
+    return SurrogateKey("systems:list", "/api/systems/")
+
+def system_key(system) -> SurrogateKey:
+    return SurrogateKey(f"system:{system.id}", f"/api/systems/{quote(system.slug)}")
+
+def social_list() -> SurrogateKey:
+    return SurrogateKey("social:list", "/api/social/")
+
+def page_key(name: str) -> SurrogateKey:
+    return SurrogateKey(f"page:{name}", f"/api/pages/{quote(name)}")
+
+def surrogate_header(keys: Iterable[SurrogateKey]) -> str:
+    return " ".join(key.key for key in keys)
+
+class CachePurger:
+    """PURGE requests to the nginx purge endpoint; a no-op while CACHE_PURGE_URL is unset"""
+
+    def __init__(self, url: str, timeout: float):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.purged = 0
+        self.failures = 0
+
+    async def purge(self, *keys: SurrogateKey):
+        if not self.url:
+            return
+        urls = sorted({key.url for key in keys})
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            results = await asyncio.gather(
+                *(client.request("PURGE", self.url + url) for url in urls), return_exceptions=True
+            )
+        for url, result in zip(urls, results):
+            # 404 means nginx had nothing cached for the URL
+            if isinstance(result, Exception) or result.status_code not in (200, 404):
+                self.failures += 1
+                logger.warning("Failed to purge %s (%s): %r", url, surrogate_header(keys), result)
+            else:
+                self.purged += 1
+
+    def stats(self) -> dict:
+        return {"enabled": bool(self.url), "purged": self.purged, "failures": self.failures}
+
+cache_purger = CachePurger(url=settings.CACHE_PURGE_URL, timeout=settings.CACHE_PURGE_TIMEOUT)
@@ -0,0 +1,120 @@
+import math
+from collections import Counter
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from ..config import settings
+from .script_cache import ScriptEntry, ScriptSnapshot
+
+def ngram_counts(text: str, n: int = 3) -> Counter:
+    padded = f"  {text.lower()} "
+    return Counter(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+class TfidfMatrix:
+    """Sparse, L2-normalised TF-IDF matrix of a set of script entries' character trigrams.
+
+    Stored as coordinate arrays (row, column, weight) so scoring a question
+    against every script is a single gather-multiply-bincount pass.
+    """
+
+    def __init__(self, entries: Sequence[ScriptEntry]):
+        self.entries = entries
+        counts = [ngram_counts(e.normalized) for e in self.entries]
+
+        self.vocab: Dict[str, int] = {}
+        df: List[int] = []
+        for grams in counts:
+            for gram in grams:
+                col = self.vocab.get(gram)
+                if col is None:
+                    self.vocab[gram] = len(df)
+                    df.append(1)
+                else:
+                    df[col] += 1
+
+        n = len(self.entries)
+        self.idf = np.log((1.0 + n) / (1.0 + np.asarray(df, dtype=np.float32))) + 1.0
+        self.unseen_idf = math.log(1.0 + n) + 1.0
+
+        nnz = sum(len(grams) for grams in counts)
+        self.rows = np.empty(nnz, dtype=np.int32)
+        self.cols = np.empty(nnz, dtype=np.int32)
+        self.data = np.empty(nnz, dtype=np.float32)
+        pos = 0
+        for row, grams in enumerate(counts):
+            end = pos + len(grams)
+            self.rows[pos:end] = row
+            self.cols[pos:end] = [self.vocab[g] for g in grams]
+            self.data[pos:end] = list(grams.values())
+            pos = end
+
+        self.data *= self.idf[self.cols]
+        norms = np.sqrt(np.bincount(self.rows, weights=self.data * self.data, minlength=n))
+        norms[norms == 0] = 1.0
+        self.data /= norms[self.rows].astype(np.float32)
+
+    def scores(self, question: str) -> np.ndarray:
+        """Cosine similarity of the question against every row"""
+        query = np.zeros(len(self.vocab), dtype=np.float32)
+        norm_sq = 0.0
+        for gram, count in ngram_counts(question).items():
+            col = self.vocab.get(gram)
+            if col is None:
+                norm_sq += (count * self.unseen_idf) ** 2
+            else:
+                weight = count * self.idf[col]
+                query[col] = weight
+                norm_sq += weight * weight
+        if norm_sq == 0:
+            return np.zeros(len(self.entries), dtype=np.float32)
+        query /= math.sqrt(norm_sq)
+        scores = np.bincount(self.rows, weights=self.data * query[self.cols], minlength=len(self.entries))
+        # float32 weights can land a hair above 1.0 on exact matches
+        return np.minimum(scores, 1.0)
+
+    def top_k(self, question: str, k: int) -> List[Tuple[ScriptEntry, float]]:
+        scores = self.scores(question)
+        if not len(scores) or k <= 0:
+            return []
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        # Highest score first, lowest id on ties
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(self.entries[i], float(scores[i])) for i in top]
+
+class TfidfMatcherEngine:
+    """Vectorised TF-IDF cosine scoring, one matrix per shard plus one over
+    the whole snapshot for suggestions"""
+
+    name = "tfidf"
+
+    def __init__(self):
+        self._version: Optional[int] = None
+        self._matrices: Dict[Optional[str], TfidfMatrix] = {}
+        self._lock = Lock()
+
+    @property
+    def threshold(self) -> float:
+        return settings.CHAT_TFIDF_THRESHOLD
+
+    def matrix(self, snapshot: ScriptSnapshot, shard: Optional[str] = None) -> TfidfMatrix:
+        """Matrix over one shard, or the whole snapshot when shard is None"""
+        with self._lock:
+            if self._version != snapshot.version:
+                self._matrices = {}
+                self._version = snapshot.version
+            matrix = self._matrices.get(shard)
+            if matrix is None:
+                entries = snapshot.entries if shard is None else snapshot.shards.get(shard, ())
+                matrix = self._matrices[shard] = TfidfMatrix(entries)
+            return matrix
+
+    def best_match(self, snapshot: ScriptSnapshot, question: str, shard: str) -> Tuple[Optional[ScriptEntry], float]:
+        top = self.matrix(snapshot, shard).top_k(question, 1)
+        if not top or top[0][1] <= 0:
+            return None, 0.0
+        return top[0]
+
+    def similar(self, snapshot: ScriptSnapshot, question: str, limit: int = 3) -> List[ScriptEntry]:
+        return [e for e, _ in self.matrix(snapshot).top_k(question, limit)]
@@ -0,0 +1,138 @@
+import time
+from collections import Counter
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import bindparam
+
+from ..config import settings
+from ..models.database import SessionLocal
+from ..models.chat_models import UnansweredQuestion
+from .write_behind import WriteBehindBuffer
+
+QuestionKey = Tuple[Optional[str], str]
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation"""
+    return " ".join(question.lower().split()).rstrip("?!. ")
+
+class PendingQuestion:
+    __slots__ = ("question", "user_session", "page_url", "first_seen", "count")
+
+    def __init__(self, question: str, user_session: Optional[str], page_url: Optional[str], first_seen: float):
+        self.question = question
+        self.user_session = user_session
+        self.page_url = page_url
+        self.first_seen = first_seen
+        self.count = 1
+
+class UnansweredQueue(WriteBehindBuffer):
+    """Deduplicating ingestion queue for unanswered chat questions.
+
+    Repeats of the same normalized question from the same session within
+    CHAT_UNANSWERED_DEDUP_WINDOW seconds collapse into one row whose
+    ask_count is bumped, whether the first copy is still queued or already
+    flushed. Questions without a session are never folded: there is nothing
+    to tell one anonymous visitor from another, so each gets its own row.
+    New rows are bulk-inserted per flush.
+    """
+
+    name = "unanswered questions"
+
+    def __init__(self, interval: float, flush_size: int, window: float):
+        super().__init__(interval, flush_size)
+        self.window = window
+        self._queued: Dict[QuestionKey, PendingQuestion] = {}
+        self._anonymous: List[PendingQuestion] = []
+        # Flushed rows still inside the dedup window: key -> (row id, first seen)
+        self._recent: Dict[QuestionKey, Tuple[int, float]] = {}
+        self._lock = Lock()
+        self._flush_lock = Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._queued) + len(self._anonymous)
+
+    def add(self, question: str, user_session: Optional[str] = None, page_url: Optional[str] = None):
+        item = PendingQuestion(question, user_session, page_url, time.monotonic())
+        with self._lock:
+            if user_session is None:
+                self._anonymous.append(item)
+            else:
+                key = (user_session, normalize_question(question))
+                queued = self._queued.get(key)
+                if queued is None:
+                    self._queued[key] = item
+                else:
+                    queued.count += 1
+            pending = len(self._queued) + len(self._anonymous)
+        self._notify(pending)
+
+    def flush(self) -> int:
+        """Insert or fold queued questions into the database; returns questions written"""
+        with self._flush_lock:
+            with self._lock:
+                queued, self._queued = self._queued, {}
+                anonymous, self._anonymous = self._anonymous, []
+            if not queued and not anonymous:
+                return 0
+
+            new_rows = {}
+            repeats: Counter = Counter()
+            for key, item in queued.items():
+                seen = self._recent.get(key)
+                if seen is not None and item.first_seen - seen[1] < self.window:
+                    repeats[seen[0]] += item.count
+                else:
+                    new_rows[key] = UnansweredQuestion(
+                        question=item.question,
+                        user_session=item.user_session,
+                        page_url=item.page_url,
+                        ask_count=item.count
+                    )
+
+            db = SessionLocal()
+            try:
+                db.add_all(UnansweredQuestion(
+                    question=item.question, page_url=item.page_url, ask_count=item.count
+                ) for item in anonymous)
+                db.add_all(new_rows.values())
+                db.flush()
+                row_ids = {key: row.id for key, row in new_rows.items()}
+                if repeats:
+                    table = UnansweredQuestion.__table__
+                    db.execute(
+                        table.update()
+                        .where(table.c.id == bindparam("row_id"))
+                        .values(ask_count=table.c.ask_count + bindparam("repeats")),
+                        [{"row_id": row_id, "repeats": n} for row_id, n in repeats.items()]
+                    )
+                db.commit()
+                for key, row_id in row_ids.items():
+                    self._recent[key] = (row_id, queued[key].first_seen)
+            except Exception:
+                db.rollback()
+                self._requeue(queued, anonymous)
+                raise
+            finally:
+                db.close()
+
+            horizon = time.monotonic() - self.window
+            self._recent = {k: v for k, v in self._recent.items() if v[1] >= horizon}
+            return sum(item.count for item in queued.values()) + len(anonymous)
+
+    def _requeue(self, queued: Dict[QuestionKey, PendingQuestion], anonymous: List[PendingQuestion]):
+        with self._lock:
+            self._anonymous[:0] = anonymous
+            for key, item in queued.items():
+                current = self._queued.get(key)
+                if current is None:
+                    self._queued[key] = item
+                else:
+                    current.count += item.count
+                    current.first_seen = min(current.first_seen, item.first_seen)
+
+unanswered_queue = UnansweredQueue(
+    interval=settings.CHAT_UNANSWERED_FLUSH_INTERVAL,
+    flush_size=settings.CHAT_UNANSWERED_FLUSH_SIZE,
+    window=settings.CHAT_UNANSWERED_DEDUP_WINDOW
+)
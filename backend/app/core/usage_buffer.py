@@ -0,0 +1,72 @@
+from collections import Counter
+from threading import Lock
+from sqlalchemy import bindparam
+
+from ..config import settings
+from ..models.database import SessionLocal
+from ..models.chat_models import ChatScript
+from .write_behind import WriteBehindBuffer
+
+class UsageBuffer(WriteBehindBuffer):
+    """Write-behind buffer for ChatScript.usage_count.
+
+    Matches only bump an in-process counter; flushes write the accumulated
+    hits as one `usage_count = usage_count + :n` executemany.
+    """
+
+    name = "chat usage counts"
+
+    def __init__(self, interval: float, flush_size: int):
+        super().__init__(interval, flush_size)
+        self._hits: Counter = Counter()
+        self._pending = 0
+        self._lock = Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def add(self, script_id: int, n: int = 1):
+        with self._lock:
+            self._hits[script_id] += n
+            self._pending += n
+            pending = self._pending
+        self._notify(pending)
+
+    def update(self, hits: Counter):
+        for script_id, n in hits.items():
+            self.add(script_id, n)
+
+    def flush(self) -> int:
+        """Write pending hits to the database; returns the number of hits written"""
+        with self._lock:
+            hits, self._hits = self._hits, Counter()
+            self._pending = 0
+        if not hits:
+            return 0
+
+        table = ChatScript.__table__
+        db = SessionLocal()
+        try:
+            db.execute(
+                table.update()
+                .where(table.c.id == bindparam("script_id"))
+                .values(usage_count=table.c.usage_count + bindparam("hits")),
+                [{"script_id": script_id, "hits": n} for script_id, n in hits.items()]
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Put the hits back so the next flush retries them
+            with self._lock:
+                self._hits.update(hits)
+                self._pending += sum(hits.values())
+            raise
+        finally:
+            db.close()
+        return sum(hits.values())
+
+usage_buffer = UsageBuffer(
+    interval=settings.CHAT_USAGE_FLUSH_INTERVAL,
+    flush_size=settings.CHAT_USAGE_FLUSH_SIZE
+)
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class WriteBehindBuffer:
+    """Base for in-process buffers flushed to the database off the request path.
+
+    Subclasses collect work under their own lock, call `_notify(pending)`
+    after each add and implement `flush()` as a blocking call. A background
+    task started from the app lifespan runs `flush()` in a worker thread every
+    `interval` seconds, as soon as `flush_size` items are pending, and once
+    more on shutdown.
+    """
+
+    name = "buffer"
+
+    def __init__(self, interval: float, flush_size: int):
+        self.interval = interval
+        self.flush_size = flush_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def flush(self) -> int:
+        raise NotImplementedError
+
+    def _notify(self, pending: int):
+        if pending >= self.flush_size and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+        await asyncio.to_thread(self.flush)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                logger.exception("Failed to flush %s", self.name)
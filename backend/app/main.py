@@ -1,15 +1,42 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .config import settings
-from .api import auth, systems, social, pages, chat
-from .models.database import engine, Base
+from .api import auth, systems, social, pages, chat, site, search, changes, sync
+from .core.change_feed import change_feed
+from .core.chat_executor import chat_executor
+from .core.compression import CompressionMiddleware
+from .core.search import ensure_search_index
+from .core.static_export import static_export_hook
+from .core.unanswered_queue import unanswered_queue
+from .core.usage_buffer import usage_buffer
+from .models.database import engine, Base, get_async_engine
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+with engine.begin() as connection:
+    ensure_search_index(connection)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await usage_buffer.start()
+    await unanswered_queue.start()
+    await change_feed.start()
+    if settings.STATIC_EXPORT_ON_WRITE and settings.STATIC_EXPORT_DIR:
+        await static_export_hook.start()
+    yield
+    await static_export_hook.stop()
+    await change_feed.stop()
+    await unanswered_queue.stop()
+    await usage_buffer.stop()
+    chat_executor.shutdown()
+    if settings.DATABASE_ASYNC:
+        await get_async_engine().dispose()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    version=settings.VERSION
+    version=settings.VERSION,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -21,11 +48,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for dynamic responses; cached public content arrives precompressed
+app.add_middleware(CompressionMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(systems.router, prefix="/api/systems", tags=["systems"])
 app.include_router(social.router, prefix="/api/social", tags=["social"])
 app.include_router(pages.router, prefix="/api/pages", tags=["pages"])
+app.include_router(site.router, prefix="/api/site", tags=["site"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
+app.include_router(changes.router, prefix="/api/changes", tags=["changes"])
+app.include_router(sync.router, prefix="/api/sync", tags=["sync"])
 app.include_router(chat.router, tags=["chat"])
 
 @app.get("/")
@@ -1,8 +1,9 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, JSON
 from sqlalchemy.sql import func
 from .database import Base
+from .content_version import BumpsContentVersion, ChangeVersioned
 
-class ChatScript(Base):
+class ChatScript(BumpsContentVersion, Base):
     __tablename__ = "chat_scripts"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -27,10 +28,12 @@ class UnansweredQuestion(Base):
     suggested_answer = Column(Text)
     is_resolved = Column(Boolean, default=False)
     admin_notes = Column(Text)
+    ask_count = Column(Integer, default=1)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-class PageContext(Base):
+class PageContext(ChangeVersioned, Base):
     __tablename__ = "page_contexts"
+    __change_type__ = "page_context"
 
     id = Column(Integer, primary_key=True, index=True)
     page_route = Column(String(200), unique=True, index=True)
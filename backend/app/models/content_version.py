@@ -0,0 +1,64 @@
+from sqlalchemy import Column, Integer, String, DateTime, event, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from .database import Base
+
+class ContentVersion(Base):
+    """Single-row counter handing out content change versions"""
+    __tablename__ = "content_version"
+
+    id = Column(Integer, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+class ContentTombstone(Base):
+    """Record of a deleted versioned row, so delta sync can report the deletion"""
+    __tablename__ = "content_tombstones"
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity_type = Column(String(32), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    change_version = Column(Integer, nullable=False, index=True)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class BumpsContentVersion:
+    """Mixin for rows whose writes advance the content version, so other
+    workers holding a copy built from them can tell it is stale"""
+
+class ChangeVersioned(BumpsContentVersion):
+    """Mixin for content served by /api/sync and the change feed: each flush
+    that inserts or updates a row stamps it with the next change version, and
+    deleting it leaves a tombstone at that version"""
+    __change_type__: str
+
+    change_version = Column(Integer, nullable=False, default=0, server_default="0", index=True)
+
+def current_change_version(session: Session) -> int:
+    return session.scalar(select(ContentVersion.value)) or 0
+
+def next_change_version(connection) -> int:
+    # A counter row rather than a sequence: writers queue on its row lock, so
+    # versions become visible in commit order and a reader that has seen
+    # version N can never later find a row stamped below N
+    table = ContentVersion.__table__
+    if connection.execute(table.update().values(value=table.c.value + 1)).rowcount == 0:
+        connection.execute(table.insert().values(id=1, value=1))
+    return connection.execute(select(table.c.value)).scalar_one()
+
+@event.listens_for(Session, "before_flush")
+def stamp_change_versions(session, flush_context, instances):
+    changed = [obj for obj in session.new if isinstance(obj, BumpsContentVersion)]
+    changed += [
+        obj for obj in session.dirty
+        if isinstance(obj, BumpsContentVersion) and session.is_modified(obj)
+    ]
+    deleted = [obj for obj in session.deleted if isinstance(obj, BumpsContentVersion)]
+    if not changed and not deleted:
+        return
+
+    version = next_change_version(session.connection())
+    for obj in changed:
+        if isinstance(obj, ChangeVersioned):
+            obj.change_version = version
+    for obj in deleted:
+        if isinstance(obj, ChangeVersioned):
+            session.add(ContentTombstone(entity_type=obj.__change_type__, entity_id=obj.id, change_version=version))
@@ -1,19 +1,103 @@
+from functools import lru_cache
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 from ..config import settings
 
 engine = create_engine(
-    settings.DATABASE_URL, 
+    settings.DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Async drivers for the sync URL schemes we deploy with
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the asyncio one"""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+@lru_cache()
+def get_async_engine():
+    # Created on first use so the sync path does not need the async drivers installed
+    return create_async_engine(settings.DATABASE_ASYNC_URL or async_database_url(settings.DATABASE_URL))
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    # Handlers read attributes after commit, which must not trigger implicit IO
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
+class ThreadedSession:
+    """The AsyncSession calls the routers use, backed by a sync Session whose
+    work runs in the threadpool. Serves requests when DATABASE_ASYNC is off."""
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    async def execute(self, statement, *args, **kwargs):
+        # Buffer the rows in the worker thread, as AsyncSession does
+        result = await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+        return result.freeze()()
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def get(self, entity, ident):
+        return await run_in_threadpool(self.sync_session.get, entity, ident)
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self):
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance):
+        await run_in_threadpool(self.sync_session.refresh, instance)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_session():
+    """Session for the API routers: an AsyncSession when DATABASE_ASYNC is set,
+    otherwise the threaded sync session"""
+    if settings.DATABASE_ASYNC:
+        async with get_async_sessionmaker()() as db:
+            yield db
+    else:
+        db = ThreadedSession(SessionLocal(expire_on_commit=False))
+        try:
+            yield db
+        finally:
+            await db.close()
@@ -1,9 +1,11 @@
 from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
 from sqlalchemy.sql import func
 from .database import Base
+from .content_version import ChangeVersioned
 
-class Page(Base):
+class Page(ChangeVersioned, Base):
     __tablename__ = "pages"
+    __change_type__ = "page"
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True, nullable=False)  # e.g., 'home', 'contact'
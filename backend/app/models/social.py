@@ -1,9 +1,11 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime
 from sqlalchemy.sql import func
 from .database import Base
+from .content_version import ChangeVersioned
 
-class SocialLink(Base):
+class SocialLink(ChangeVersioned, Base):
     __tablename__ = "social_links"
+    __change_type__ = "social_link"
     
     id = Column(Integer, primary_key=True, index=True)
     platform = Column(String, unique=True, nullable=False)
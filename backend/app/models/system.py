@@ -1,16 +1,19 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from .database import Base
+from .content_version import ChangeVersioned
 
-class System(Base):
+class System(ChangeVersioned, Base):
     __tablename__ = "systems"
+    __change_type__ = "system"
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True, nullable=False)
     slug = Column(String, unique=True, index=True, nullable=False)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
-    key_features = Column(Text)  # JSON string
+    key_features = Column(JSON().with_variant(JSONB(), "postgresql"), default=list)
     learn_more_url = Column(String, default="#")
     icon = Column(String, nullable=True)
     order = Column(Integer, default=0)
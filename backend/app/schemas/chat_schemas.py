@@ -1,9 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
 class ChatQuery(BaseModel):
-    question: str
+    question: str = Field(..., max_length=500)
     session_id: Optional[str] = None
     page_url: Optional[str] = None
 
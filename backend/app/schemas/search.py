@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class SearchHit(BaseModel):
+    entity_type: str  # "system", "page" or "script"
+    entity_id: int
+    key: Optional[str] = None  # system slug or page name
+    title: str
+    snippet: str
+    score: float
+
+class SearchResults(BaseModel):
+    query: str
+    total: int
+    page: int
+    page_size: int
+    results: List[SearchHit]
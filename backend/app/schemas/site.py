@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Dict, List
+from .system import SystemInDB
+from .social import SocialLinkInDB
+from .page import PageInDB
+
+class SiteBootstrap(BaseModel):
+    systems: List[SystemInDB]
+    social_links: List[SocialLinkInDB]
+    pages: Dict[str, PageInDB]
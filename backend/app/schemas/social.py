@@ -19,6 +19,9 @@ class SocialLinkUpdate(BaseModel):
     is_active: Optional[bool] = None
     order: Optional[int] = None
 
+class SocialLinkBulkUpdate(SocialLinkUpdate):
+    id: int
+
 class SocialLinkInDB(SocialLinkBase):
     id: int
     created_at: datetime
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import List
+from .system import SystemInDB
+from .social import SocialLinkInDB
+from .page import PageInDB
+
+class SystemChanges(BaseModel):
+    updated: List[SystemInDB]
+    deleted: List[int]
+
+class SocialLinkChanges(BaseModel):
+    updated: List[SocialLinkInDB]
+    deleted: List[int]
+
+class PageChanges(BaseModel):
+    updated: List[PageInDB]
+    deleted: List[int]
+
+class SyncResponse(BaseModel):
+    version: int  # pass back as `since` on the next sync
+    full: bool  # True when `updated` is the whole collection rather than a delta
+    systems: SystemChanges
+    social_links: SocialLinkChanges
+    pages: PageChanges
@@ -1,7 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
-import json
 
 class SystemBase(BaseModel):
     name: str
@@ -26,6 +25,9 @@ class SystemUpdate(BaseModel):
     order: Optional[int] = None
     is_active: Optional[bool] = None
 
+class SystemBulkUpdate(SystemUpdate):
+    id: int
+
 class SystemInDB(SystemBase):
     id: int
     slug: str
@@ -33,10 +35,4 @@ class SystemInDB(SystemBase):
     updated_at: Optional[datetime] = None
     
     class Config:
-        from_attributes = True
-        
-    @property
-    def key_features_list(self) -> List[str]:
-        if isinstance(self.key_features, str):
-            return json.loads(self.key_features)
-        return self.key_features or []
\ No newline at end of file
+        from_attributes = True
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""Synthetic chat script corpora and perturbed queries with ground truth.
+
+Scripts are the seed_chat.py patterns specialised with generated product
+names, so the corpus is full of near-duplicates the matcher has to tell
+apart. Queries are copies of sampled scripts with case, punctuation, filler
+and character-level typos applied; each carries the id of the script it was
+made from.
+"""
+import random
+from typing import Iterator, List, NamedTuple, Optional
+
+from seed_chat import INITIAL_SCRIPTS
+
+SYLLABLES = [
+    "ka", "lo", "mi", "ra", "ven", "tor", "zu", "pex", "an", "dra",
+    "mo", "qui", "sel", "tar", "vo", "xi", "ber", "cal", "dus", "fen",
+    "gor", "hal", "jin", "kor", "lum", "nex", "orb", "pra", "syl", "tek"
+]
+CONNECTORS = ["for", "in", "with", "on"]
+FILLERS = ["please tell me", "hey,", "quick question:", "can you explain", "i want to know"]
+PAGES = 50
+
+class SyntheticScript(NamedTuple):
+    question_pattern: str
+    answer: str
+    category: str
+    page_context: str
+
+class SyntheticQuery(NamedTuple):
+    question: str
+    page_url: Optional[str]
+    expected_index: int
+
+def product_name(n: int) -> str:
+    """Unique two-word name for n built from four base-len(SYLLABLES) digits"""
+    base = len(SYLLABLES)
+    digits = [SYLLABLES[(n // base ** k) % base] for k in range(4)]
+    name = f"{(digits[0] + digits[1]).capitalize()} {(digits[2] + digits[3]).capitalize()}"
+    overflow = n // base ** 4
+    return f"{name} {overflow}" if overflow else name
+
+def generate_scripts(rows: int, seed: int = 0) -> Iterator[SyntheticScript]:
+    rng = random.Random(seed)
+    for i in range(rows):
+        base = INITIAL_SCRIPTS[i % len(INITIAL_SCRIPTS)]
+        name = product_name(i // len(INITIAL_SCRIPTS))
+        connector = CONNECTORS[rng.randrange(len(CONNECTORS))]
+        pattern = f"{base['question_pattern'].rstrip('?')} {connector} {name}"
+        if rng.random() < 0.5:
+            page_context = "global"
+        else:
+            page_context = f"/system/synthetic-{rng.randrange(PAGES)}"
+        yield SyntheticScript(
+            question_pattern=pattern,
+            answer=f"{base['answer']} ({name})",
+            category=base["category"],
+            page_context=page_context
+        )
+
+def typo(text: str, rng: random.Random) -> str:
+    if len(text) < 4:
+        return text
+    i = rng.randrange(1, len(text) - 1)
+    op = rng.randrange(4)
+    if op == 0:
+        return text[:i] + text[i + 1:]
+    if op == 1:
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    letter = chr(rng.randrange(ord("a"), ord("z") + 1))
+    if op == 2:
+        return text[:i] + letter + text[i:]
+    return text[:i] + letter + text[i + 1:]
+
+def perturb(pattern: str, rng: random.Random, max_typos: int = 2) -> str:
+    question = pattern
+    for _ in range(rng.randrange(max_typos + 1)):
+        question = typo(question, rng)
+    if rng.random() < 0.5:
+        question = question.lower()
+    if rng.random() < 0.3:
+        question = f"{FILLERS[rng.randrange(len(FILLERS))]} {question}"
+    if rng.random() < 0.5:
+        question += "?"
+    return question
+
+def generate_queries(scripts: List[SyntheticScript], count: int, seed: int = 1) -> List[SyntheticQuery]:
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        index = rng.randrange(len(scripts))
+        script = scripts[index]
+        page_url = script.page_context if rng.random() < 0.7 and script.page_context != "global" else None
+        queries.append(SyntheticQuery(perturb(script.question_pattern, rng), page_url, index))
+    return queries
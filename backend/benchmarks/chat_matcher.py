@@ -0,0 +1,192 @@
+"""Chat matcher benchmark and quality harness.
+
+Loads synthetic ChatScript corpora of the requested sizes into an offline
+SQLite database, builds the matcher snapshot, replays perturbed queries
+through the same path as /api/chat/query and writes latency percentiles,
+memory footprint and top-1 accuracy to a JSON file that can be diffed
+between releases.
+
+    cd backend
+    python -m benchmarks.chat_matcher --rows 1000 10000 100000 --output chat_bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import List
+
+def percentiles(samples: List[float]) -> dict:
+    """p50/p95/p99/mean/max of samples in seconds, reported in milliseconds"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] * 1000
+
+    return {
+        "count": len(ordered),
+        "p50_ms": rank(50),
+        "p95_ms": rank(95),
+        "p99_ms": rank(99),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "max_ms": ordered[-1] * 1000
+    }
+
+def load_corpus(db, scripts, batch_size: int = 10000):
+    from app.models.chat_models import ChatScript
+
+    table = ChatScript.__table__
+    db.execute(table.delete())
+    ids = []
+    for start in range(0, len(scripts), batch_size):
+        batch = scripts[start:start + batch_size]
+        db.execute(table.insert(), [{
+            "id": start + i + 1,
+            "question_pattern": s.question_pattern,
+            "answer": s.answer,
+            "category": s.category,
+            "page_context": s.page_context,
+            "confidence_score": 1.0,
+            "usage_count": 0,
+            "is_learned": False,
+            "requires_approval": False
+        } for i, s in enumerate(batch)])
+        ids.extend(range(start + 1, start + len(batch) + 1))
+    db.commit()
+    return ids
+
+def run_size(db, rows: int, query_count: int, suggestion_count: int, seed: int) -> dict:
+    from app.core.chat_matcher import (
+        compute_response, corrected_question, get_matcher, get_similar_questions, normalize_query
+    )
+    from app.core.script_cache import script_cache
+    from app.schemas.chat_schemas import ChatQuery
+    from benchmarks.chat_corpus import generate_queries, generate_scripts
+
+    scripts = list(generate_scripts(rows, seed=seed))
+    started = time.perf_counter()
+    ids = load_corpus(db, scripts)
+    load_s = time.perf_counter() - started
+    queries = generate_queries(scripts, query_count, seed=seed + 1)
+
+    # Memory of the snapshot, indexes and vocabulary, then a clean timed build
+    tracemalloc.start()
+    script_cache.rebuild(db)
+    snapshot_bytes, build_peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    started = time.perf_counter()
+    snapshot = script_cache.rebuild(db)
+    build_s = time.perf_counter() - started
+
+    def answer(q):
+        query = normalize_query(ChatQuery(question=q.question, page_url=q.page_url))
+        return compute_response(snapshot, query, corrected_question(query.question))
+
+    # First query pays for lazily built engine state (e.g. the TF-IDF matrices)
+    started = time.perf_counter()
+    answer(queries[0])
+    warmup_s = time.perf_counter() - started
+
+    latencies = []
+    correct = answered = 0
+    for q in queries:
+        started = time.perf_counter()
+        response = answer(q)
+        latencies.append(time.perf_counter() - started)
+        if response.script_id is not None:
+            answered += 1
+            if response.script_id == ids[q.expected_index]:
+                correct += 1
+
+    suggestion_latencies = []
+    for q in queries[:suggestion_count]:
+        started = time.perf_counter()
+        get_similar_questions(snapshot, q.question, limit=3)
+        suggestion_latencies.append(time.perf_counter() - started)
+
+    return {
+        "rows": rows,
+        "shards": len(snapshot.shards),
+        "load_seconds": load_s,
+        "build_seconds": build_s,
+        "warmup_seconds": warmup_s,
+        "memory": {
+            "snapshot_bytes": snapshot_bytes,
+            "build_peak_bytes": build_peak_bytes,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        },
+        "query_chat": percentiles(latencies),
+        "get_similar_questions": percentiles(suggestion_latencies),
+        "quality": {
+            "queries": len(queries),
+            "answered": answered,
+            "top1_correct": correct,
+            "top1_accuracy": correct / len(queries) if queries else 0,
+            "answer_rate": answered / len(queries) if queries else 0
+        },
+        "engine": get_matcher().name
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000], help="corpus sizes to run")
+    parser.add_argument("--queries", type=int, default=500, help="perturbed queries replayed per size")
+    parser.add_argument("--suggestion-queries", type=int, default=50, help="queries timed through get_similar_questions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database", help="SQLite file to use (default: a temporary file)")
+    parser.add_argument("--output", default="chat_bench.json", help="JSON result file")
+    args = parser.parse_args(argv)
+
+    database = args.database or os.path.join(tempfile.mkdtemp(prefix="chat_bench_"), "chat_bench.db")
+    # Settings are read at import time, so point the app at the bench database first
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from app.config import settings
+    from app.models.database import Base, SessionLocal, engine
+    from app.models import chat_models  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        results = []
+        for rows in args.rows:
+            result = run_size(db, rows, args.queries, args.suggestion_queries, args.seed)
+            results.append(result)
+            print(
+                f"{rows:>8} rows  p50 {result['query_chat']['p50_ms']:8.2f} ms  "
+                f"p99 {result['query_chat']['p99_ms']:8.2f} ms  "
+                f"top1 {result['quality']['top1_accuracy']:.3f}  "
+                f"snapshot {result['memory']['snapshot_bytes'] / 1e6:.1f} MB"
+            )
+    finally:
+        db.close()
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "settings": {
+                "CHAT_MATCH_ENGINE": settings.CHAT_MATCH_ENGINE,
+                "CHAT_SPELL_CORRECTION": settings.CHAT_SPELL_CORRECTION,
+                "CHAT_PAGE_BOOST": settings.CHAT_PAGE_BOOST,
+                "CHAT_SHARD_FALLBACK": settings.CHAT_SHARD_FALLBACK
+            }
+        },
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
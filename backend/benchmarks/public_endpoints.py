@@ -0,0 +1,165 @@
+"""Public endpoint throughput benchmark.
+
+Seeds an offline SQLite database with the `seed.py` content and drives the
+public read endpoints in-process over ASGI. For each endpoint it reports
+requests/sec and latency percentiles for three paths:
+
+- "bytes": the live route, serving cached pre-serialized JSON
+- "revalidate": the live route, answering If-None-Match with 304
+- "response_model": the same query served through ORM hydration and
+  `response_model` validation on every request
+
+    cd backend
+    python -m benchmarks.public_endpoints --requests 2000 --concurrency 32 --output public_bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+ENDPOINTS = {
+    "systems": "/api/systems/",
+    "social": "/api/social/",
+    "page": "/api/pages/home",
+    "bootstrap": "/api/site/bootstrap?pages=home,about",
+}
+
+def response_model_router():
+    """The public reads as they were served before the byte cache"""
+    from typing import List
+    from fastapi import APIRouter, Depends, HTTPException
+    from sqlalchemy import select
+    from app.models.database import get_session
+    from app.models.page import Page
+    from app.models.social import SocialLink
+    from app.models.system import System
+    from app.schemas.page import PageInDB
+    from app.schemas.social import SocialLinkInDB
+    from app.schemas.system import SystemInDB
+
+    router = APIRouter()
+
+    @router.get("/api/systems/", response_model=List[SystemInDB])
+    async def systems(db=Depends(get_session)):
+        result = await db.execute(select(System).where(System.is_active == True).order_by(System.order))
+        return result.scalars().all()
+
+    @router.get("/api/social/", response_model=List[SocialLinkInDB])
+    async def social(db=Depends(get_session)):
+        result = await db.execute(select(SocialLink).where(SocialLink.is_active == True).order_by(SocialLink.order))
+        return result.scalars().all()
+
+    @router.get("/api/pages/{page_name}", response_model=PageInDB)
+    async def page(page_name: str, db=Depends(get_session)):
+        result = await db.execute(select(Page).where(Page.name == page_name, Page.is_published == True))
+        found = result.scalars().first()
+        if not found:
+            raise HTTPException(status_code=404, detail="Page not found")
+        return found
+
+    return router
+
+async def drive(client, url: str, requests: int, concurrency: int, headers=None) -> dict:
+    from benchmarks.chat_matcher import percentiles
+
+    latencies = []
+    statuses: Counter = Counter()
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests_per_second": requests / elapsed,
+        "latency": percentiles(latencies),
+        "statuses": dict(statuses)
+    }
+
+async def run(endpoints, requests: int, concurrency: int) -> dict:
+    import httpx
+    from fastapi import FastAPI
+    from app.main import app
+
+    baseline = FastAPI()
+    baseline.include_router(response_model_router())
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as live, \
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=baseline), base_url="http://bench") as model:
+        for name in endpoints:
+            url = ENDPOINTS[name]
+            warm = await live.get(url)
+            etag = warm.headers.get("etag")
+            result = {
+                "bytes": await drive(live, url, requests, concurrency),
+                "revalidate": await drive(live, url, requests, concurrency, headers={"If-None-Match": etag}) if etag else None
+            }
+            if name != "bootstrap":
+                await model.get(url)
+                result["response_model"] = await drive(model, url, requests, concurrency)
+                if result["response_model"]["requests_per_second"]:
+                    result["speedup"] = (
+                        result["bytes"]["requests_per_second"] / result["response_model"]["requests_per_second"]
+                    )
+            results[name] = result
+            print(
+                f"{name:>10}  bytes {result['bytes']['requests_per_second']:9.0f} req/s"
+                + (f"  response_model {result['response_model']['requests_per_second']:9.0f} req/s"
+                   if "response_model" in result else "")
+            )
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint and path")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight at once")
+    parser.add_argument("--database", help="SQLite file to use (default: a temporary file)")
+    parser.add_argument("--output", default="public_bench.json", help="JSON result file")
+    args = parser.parse_args(argv)
+
+    database = args.database or os.path.join(tempfile.mkdtemp(prefix="public_bench_"), "public_bench.db")
+    # Settings are read at import time, so point the app at the bench database first
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from app.config import settings
+    from app.models.database import Base, engine
+    from seed import seed_database
+
+    Base.metadata.create_all(bind=engine)
+    seed_database()
+    results = asyncio.run(run(args.endpoints, args.requests, args.concurrency))
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "settings": {
+                "DATABASE_ASYNC": settings.DATABASE_ASYNC,
+                "CONTENT_CACHE_TTL": settings.CONTENT_CACHE_TTL
+            }
+        },
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+from app.config import settings
+from app.models.database import SessionLocal
+from app.core.index_snapshot import table_content_hash, write_artifact
+from app.core.script_cache import script_cache
+
+def build_chat_index():
+    """Write the chat matcher index artifact ahead of starting workers"""
+    if not settings.CHAT_INDEX_SNAPSHOT_PATH:
+        print("CHAT_INDEX_SNAPSHOT_PATH is not set")
+        return
+    db = SessionLocal()
+    content_hash = table_content_hash(db)
+    snapshot = script_cache.rebuild(db)
+    write_artifact(settings.CHAT_INDEX_SNAPSHOT_PATH, list(snapshot.entries), content_hash)
+    db.close()
+
+    print(f"✅ Chat index written to {settings.CHAT_INDEX_SNAPSHOT_PATH} ({len(snapshot)} scripts)")
+
+if __name__ == "__main__":
+    build_chat_index()
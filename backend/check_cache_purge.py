@@ -0,0 +1,83 @@
+"""Check that admin writes purge the nginx proxy cache.
+
+Runs the app in-process against a throwaway SQLite database with
+CACHE_PURGE_URL pointed at a local stand-in for the nginx purge endpoint, then
+verifies that public responses carry their surrogate keys and that updating a
+system, a social link and a page sends PURGE for exactly the URLs those keys
+tag. Needs no nginx:
+
+    cd backend
+    python check_cache_purge.py
+"""
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+purged = []
+
+class PurgeRecorder(BaseHTTPRequestHandler):
+    def do_PURGE(self):
+        purged.append(self.path)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+def expect_purges(*paths: str):
+    received = sorted(purged)
+    purged.clear()
+    assert received == sorted(paths), f"expected PURGE {sorted(paths)}, got {received}"
+
+def check_cache_purge():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PurgeRecorder)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Settings are read at import time, so configure the app before importing it
+    database = os.path.join(tempfile.mkdtemp(prefix="purge_check_"), "purge_check.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ["CACHE_PURGE_URL"] = f"http://127.0.0.1:{server.server_port}/purge"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from fastapi.testclient import TestClient
+    from app.config import settings
+    from app.main import app
+    from seed import seed_database
+
+    seed_database()
+    with TestClient(app) as client:
+        token = client.post("/api/auth/login", json={
+            "username": settings.ADMIN_USERNAME, "password": settings.ADMIN_PASSWORD
+        }).json()["access_token"]
+        admin = {"Authorization": f"Bearer {token}"}
+
+        response = client.get("/api/systems/")
+        assert response.headers["surrogate-key"] == "systems:list", response.headers
+        system = response.json()[0]
+        response = client.get(f"/api/systems/{system['slug']}")
+        assert response.headers["surrogate-key"] == f"system:{system['id']}", response.headers
+        assert client.get("/api/pages/home").headers["surrogate-key"] == "page:home"
+
+        client.put(f"/api/systems/{system['id']}", json={"title": "Updated"}, headers=admin).raise_for_status()
+        expect_purges("/purge/api/systems/", f"/purge/api/systems/{system['slug']}")
+
+        link = client.get("/api/social/").json()[0]
+        client.put(f"/api/social/{link['id']}", json={"order": 9}, headers=admin).raise_for_status()
+        expect_purges("/purge/api/social/")
+
+        page = client.get("/api/pages/home").json()
+        client.put(f"/api/pages/{page['id']}", json={"title": "Updated"}, headers=admin).raise_for_status()
+        expect_purges("/purge/api/pages/home")
+
+        # Reads never purge
+        client.get("/api/systems/")
+        expect_purges()
+
+    server.shutdown()
+    print("✅ Admin writes purge the proxy cache for the surrogate keys they touch")
+
+if __name__ == "__main__":
+    check_cache_purge()
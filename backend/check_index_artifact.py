@@ -0,0 +1,84 @@
+"""Check that the memory-mapped chat index artifact round-trips its entries.
+
+Writes artifacts for a few hand-picked entry sets (empty, single row, unicode
+and empty strings, several shards) and checks that mapping them gives back
+exactly the entries that went in. Then seeds the sample scripts into a
+throwaway SQLite database and loads the artifact twice, as the first and
+second boot with CHAT_INDEX_SNAPSHOT_PATH set do, checking that the mapped
+snapshot answers like one built from the database:
+
+    cd backend
+    python check_index_artifact.py
+"""
+import os
+import sys
+import tempfile
+
+def expect_round_trip(directory: str, name: str, entries):
+    from app.core.index_snapshot import open_artifact, write_artifact
+
+    path = os.path.join(directory, f"{name}.chatix")
+    write_artifact(path, entries, f"check:{name}")
+    mapped = open_artifact(path)
+    assert mapped is not None, f"{name}: artifact could not be mapped"
+    try:
+        assert mapped.content_hash == f"check:{name}", f"{name}: content hash {mapped.content_hash!r}"
+        decoded = list(mapped.entries())
+        assert decoded == entries, f"{name}: mapped entries differ from the written ones:\n{decoded}\n!=\n{entries}"
+    finally:
+        mapped.close()
+
+def check_round_trip(directory: str):
+    from app.core.script_cache import make_entry
+
+    expect_round_trip(directory, "empty", [])
+    expect_round_trip(directory, "single", [make_entry(1, "What is GOAT?", "GOAT is a subsystem.", None)])
+    expect_round_trip(directory, "mixed", [
+        make_entry(2, "What is GOAT?", "GOAT is a subsystem.", "global"),
+        make_entry(5, "Où est le café ☕", "Über 日本語 answer", "/systems/goat"),
+        make_entry(7, "", "Empty pattern", "/about"),
+        make_entry(9, "Empty answer", "", "/systems/goat"),
+        make_entry(11, "How much does Vault Forge cost?", "See /pricing", None),
+    ])
+
+def check_second_boot(directory: str):
+    from app.core.chat_matcher import compute_response
+    from app.core.script_cache import ScriptCache
+    from app.models.database import SessionLocal
+    from app.schemas.chat_schemas import ChatQuery
+
+    path = os.path.join(directory, "boot.chatix")
+    db = SessionLocal()
+    cache = ScriptCache()
+    try:
+        built = ScriptCache().load_artifact(db, path)
+        assert os.path.exists(path), "first boot did not write the artifact"
+        mapped = cache.load_artifact(db, path)
+        assert cache.mapped is not None, "second boot rebuilt instead of mapping the artifact"
+        assert mapped.entries == built.entries, "second boot maps different entries than the first built"
+        for entry in built.entries:
+            response = compute_response(mapped, ChatQuery(question=entry.pattern))
+            assert response.answer == built.by_id[response.script_id].answer, \
+                f"mapped snapshot answers {entry.pattern!r} with {response.answer!r}"
+    finally:
+        if cache.mapped is not None:
+            cache.mapped.close()
+        db.close()
+
+def check_index_artifact():
+    # Settings are read at import time, so configure the app before importing it
+    directory = tempfile.mkdtemp(prefix="index_artifact_check_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'index_artifact_check.db')}"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from app.models.database import Base, engine
+    from seed_chat import seed_chat_data
+
+    check_round_trip(directory)
+    Base.metadata.create_all(bind=engine)
+    seed_chat_data()
+    check_second_boot(directory)
+    print("✅ Index artifacts map back to the entries written and answer like the database")
+
+if __name__ == "__main__":
+    check_index_artifact()
@@ -0,0 +1,21 @@
+import sys
+from app.config import settings
+from app.models.database import SessionLocal
+from app.core.static_export import export_static
+
+def export(directory: str):
+    """Render every public API payload, precompressed, to files nginx can serve directly"""
+    if not directory:
+        print("STATIC_EXPORT_DIR is not set")
+        return
+    db = SessionLocal()
+    stats = export_static(db, directory)
+    db.close()
+
+    print(
+        f"✅ Static API exported to {directory} at version {stats['version']} "
+        f"({stats['written']} written, {stats['unchanged']} unchanged, {stats['removed']} removed)"
+    )
+
+if __name__ == "__main__":
+    export(sys.argv[1] if len(sys.argv) > 1 else settings.STATIC_EXPORT_DIR)
@@ -1,4 +1,3 @@
-import json
 from app.models.database import SessionLocal, engine
 from app.models.system import System
 from app.models.social import SocialLink
@@ -8,10 +7,12 @@ from app.core.security import get_password_hash
 def seed_database():
     db = SessionLocal()
     
-    # Clear existing data
-    db.query(System).delete()
-    db.query(SocialLink).delete()
-    db.query(Page).delete()
+    # Clear existing data through the ORM, so /api/sync clients get tombstones
+    for model in (System, SocialLink, Page):
+        for obj in db.query(model):
+            db.delete(obj)
+    # The unit of work inserts before it deletes, so the old unique names must go first
+    db.flush()
     
     # Seed systems
     systems = [
@@ -20,12 +21,12 @@ def seed_database():
             "slug": "true-mark-mint",
             "title": "True Mark Mint",
             "description": "Advanced digital asset minting platform with blockchain verification and smart contract integration for secure token creation.",
-            "key_features": json.dumps([
+            "key_features": [
                 "Blockchain-based minting",
                 "Smart contract automation",
                 "Multi-chain support",
                 "Real-time verification"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/true-mark-mint",
             "icon": "🔷",
             "order": 1
@@ -35,12 +36,12 @@ def seed_database():
             "slug": "alpha-certsig-mint",
             "title": "Alpha CertSig Mint",
             "description": "Certificate signature and minting system for digital credentials with cryptographic verification and immutable record keeping.",
-            "key_features": json.dumps([
+            "key_features": [
                 "Digital certificate generation",
                 "Cryptographic signatures",
                 "Immutable record storage",
                 "Verification API"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/alpha-certsig",
             "icon": "📜",
             "order": 2
@@ -50,12 +51,12 @@ def seed_database():
             "slug": "goat",
             "title": "GOAT (Global Optimization & Analytics Tool)",
             "description": "Advanced analytics and optimization platform for complex business processes and decision-making systems.",
-            "key_features": json.dumps([
+            "key_features": [
                 "Predictive analytics",
                 "Process optimization",
                 "Real-time monitoring",
                 "Machine learning integration"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/goat",
             "icon": "🐐",
             "order": 3
@@ -65,12 +66,12 @@ def seed_database():
             "slug": "apex-doc",
             "title": "APEX Doc",
             "description": "Intelligent document management and processing system with automated workflows and advanced search capabilities.",
-            "key_features": json.dumps([
+            "key_features": [
                 "Automated document processing",
                 "Intelligent search",
                 "Version control",
                 "Collaboration tools"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/apex-doc",
             "icon": "📄",
             "order": 4
@@ -80,12 +81,12 @@ def seed_database():
             "slug": "vault-forge",
             "title": "Vault Forge",
             "description": "Secure data vault and encryption system for sensitive information with multi-layer security protocols.",
-            "key_features": json.dumps([
+            "key_features": [
                 "End-to-end encryption",
                 "Multi-factor authentication",
                 "Audit logging",
                 "Key management"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/vault-forge",
             "icon": "🔒",
             "order": 5
@@ -95,12 +96,12 @@ def seed_database():
             "slug": "cali-cognitive",
             "title": "CALI Cognitive Systems",
             "description": "Cognitive computing platform that mimics human thought processes for advanced problem-solving and decision support.",
-            "key_features": json.dumps([
+            "key_features": [
                 "Neural network architecture",
                 "Pattern recognition",
                 "Natural language processing",
                 "Cognitive learning"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/cali-cognitive",
             "icon": "🧠",
             "order": 6
@@ -110,12 +111,12 @@ def seed_database():
             "slug": "kay-gee",
             "title": "Kay Gee 1.0",
             "description": "Knowledge graph system for interconnected data representation and intelligent relationship mapping.",
-            "key_features": json.dumps([
+            "key_features": [
                 "Graph database integration",
                 "Relationship mapping",
                 "Semantic search",
                 "Data visualization"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/kay-gee",
             "icon": "🕸️",
             "order": 7
@@ -125,12 +126,12 @@ def seed_database():
             "slug": "cali-x-one",
             "title": "Cali X One",
             "description": "Unified cognitive platform combining multiple AI capabilities into a single, integrated system.",
-            "key_features": json.dumps([
+            "key_features": [
                 "Multi-AI integration",
                 "Unified interface",
                 "Cross-platform compatibility",
                 "API-first design"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/cali-x-one",
             "icon": "⚡",
             "order": 8
@@ -140,12 +141,12 @@ def seed_database():
             "slug": "ecm",
             "title": "Enterprise Content Management (ECM)",
             "description": "Comprehensive content management solution for enterprise-level document and digital asset organization.",
-            "key_features": json.dumps([
+            "key_features": [
                 "Content lifecycle management",
                 "Digital asset management",
                 "Workflow automation",
                 "Compliance tracking"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/ecm",
             "icon": "📊",
             "order": 9
@@ -155,12 +156,12 @@ def seed_database():
             "slug": "ucm",
             "title": "Unified Communications Manager (UCM)",
             "description": "Centralized communications platform integrating voice, video, and messaging across multiple channels.",
-            "key_features": json.dumps([
+            "key_features": [
                 "Multi-channel integration",
                 "Real-time communications",
                 "Presence management",
                 "Session control"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/ucm",
             "icon": "📞",
             "order": 10
@@ -170,12 +171,12 @@ def seed_database():
             "slug": "caleon-4-core",
             "title": "Caleon 4 Core",
             "description": "Quad-core cognitive processing system for distributed intelligence and parallel computing.",
-            "key_features": json.dumps([
+            "key_features": [
                 "Parallel processing",
                 "Distributed computing",
                 "Load balancing",
                 "Fault tolerance"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/caleon-4",
             "icon": "⚙️",
             "order": 11
@@ -185,12 +186,12 @@ def seed_database():
             "slug": "orb-assistant",
             "title": "Orb Assistant",
             "description": "Intelligent virtual assistant with natural language understanding and contextual awareness.",
-            "key_features": json.dumps([
+            "key_features": [
                 "Natural language processing",
                 "Contextual awareness",
                 "Task automation",
                 "Learning capabilities"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/orb-assistant",
             "icon": "🔄",
             "order": 12
@@ -200,12 +201,12 @@ def seed_database():
             "slug": "cali-orb",
             "title": "CALI ORB",
             "description": "Orchestration and routing bridge for cognitive systems, enabling seamless integration and communication.",
-            "key_features": json.dumps([
+            "key_features": [
                 "System orchestration",
                 "Intelligent routing",
                 "Protocol translation",
                 "Service mesh"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/cali-orb",
             "icon": "🌐",
             "order": 13
@@ -215,12 +216,12 @@ def seed_database():
             "slug": "orb-ui",
             "title": "Orb-UI",
             "description": "Unified user interface for all CALI ecosystem components with consistent design and interaction patterns.",
-            "key_features": json.dumps([
+            "key_features": [
                 "Unified dashboard",
                 "Component library",
                 "Real-time updates",
                 "Responsive design"
-            ]),
+            ],
             "learn_more_url": "https://docs.spruked.com/orb-ui",
             "icon": "🎨",
             "order": 14
@@ -2,6 +2,51 @@ import json
 from app.models.database import SessionLocal
 from app.models.chat_models import ChatScript, PageContext
 
+INITIAL_SCRIPTS = [
+    {
+        "question_pattern": "What is GOAT?",
+        "answer": "GOAT is our comprehensive content creation platform for books, audiobooks, podcasts, and more. It provides enterprise-grade tools for content management and distribution.",
+        "category": "general",
+        "page_context": "global"
+    },
+    {
+        "question_pattern": "How much does it cost",
+        "answer": "Our pricing starts at $19.99 for the first GB of data processing, with tiered packages available. Contact us for a custom quote based on your needs.",
+        "category": "pricing",
+        "page_context": "global"
+    },
+    {
+        "question_pattern": "What is True Mark Mint",
+        "answer": "True Mark Mint is our advanced digital asset minting platform with blockchain verification and smart contract integration for secure token creation.",
+        "category": "general",
+        "page_context": "/system/true-mark-mint"
+    },
+    {
+        "question_pattern": "How does Alpha CertSig Mint work",
+        "answer": "Alpha CertSig Mint provides certificate signature and minting system for digital credentials with cryptographic verification and immutable record keeping.",
+        "category": "technical",
+        "page_context": "/system/alpha-certsig-mint"
+    },
+    {
+        "question_pattern": "What is CALI Cognitive Systems",
+        "answer": "CALI Cognitive Systems is our cognitive computing platform that mimics human thought processes for advanced problem-solving and decision support.",
+        "category": "technical",
+        "page_context": "/system/cali-cognitive"
+    },
+    {
+        "question_pattern": "How do I contact you",
+        "answer": "You can reach us at info@spruked.com or visit our social media channels. We're here to help with any questions about our systems and services.",
+        "category": "general",
+        "page_context": "global"
+    },
+    {
+        "question_pattern": "What makes your systems different",
+        "answer": "Our systems are built with cutting-edge cognitive computing, blockchain integration, and enterprise-grade security. Each system is designed to work seamlessly together as part of our CALI ecosystem.",
+        "category": "general",
+        "page_context": "global"
+    }
+]
+
 def seed_chat_data():
     """Seed initial chat scripts and page contexts"""
     db = SessionLocal()
@@ -11,52 +56,7 @@ def seed_chat_data():
     db.query(PageContext).delete()
 
     # Seed initial chat scripts
-    initial_scripts = [
-        {
-            "question_pattern": "What is GOAT?",
-            "answer": "GOAT is our comprehensive content creation platform for books, audiobooks, podcasts, and more. It provides enterprise-grade tools for content management and distribution.",
-            "category": "general",
-            "page_context": "global"
-        },
-        {
-            "question_pattern": "How much does it cost",
-            "answer": "Our pricing starts at $19.99 for the first GB of data processing, with tiered packages available. Contact us for a custom quote based on your needs.",
-            "category": "pricing",
-            "page_context": "global"
-        },
-        {
-            "question_pattern": "What is True Mark Mint",
-            "answer": "True Mark Mint is our advanced digital asset minting platform with blockchain verification and smart contract integration for secure token creation.",
-            "category": "general",
-            "page_context": "/system/true-mark-mint"
-        },
-        {
-            "question_pattern": "How does Alpha CertSig Mint work",
-            "answer": "Alpha CertSig Mint provides certificate signature and minting system for digital credentials with cryptographic verification and immutable record keeping.",
-            "category": "technical",
-            "page_context": "/system/alpha-certsig-mint"
-        },
-        {
-            "question_pattern": "What is CALI Cognitive Systems",
-            "answer": "CALI Cognitive Systems is our cognitive computing platform that mimics human thought processes for advanced problem-solving and decision support.",
-            "category": "technical",
-            "page_context": "/system/cali-cognitive"
-        },
-        {
-            "question_pattern": "How do I contact you",
-            "answer": "You can reach us at info@spruked.com or visit our social media channels. We're here to help with any questions about our systems and services.",
-            "category": "general",
-            "page_context": "global"
-        },
-        {
-            "question_pattern": "What makes your systems different",
-            "answer": "Our systems are built with cutting-edge cognitive computing, blockchain integration, and enterprise-grade security. Each system is designed to work seamlessly together as part of our CALI ecosystem.",
-            "category": "general",
-            "page_context": "global"
-        }
-    ]
-
-    for script_data in initial_scripts:
+    for script_data in INITIAL_SCRIPTS:
         script = ChatScript(**script_data)
         db.add(script)
 
@@ -28,9 +28,9 @@ const Card = ({ system, index }) => {
           >
             Learn More →
           </Link>
-          {system.key_features && (
+          {system.key_features?.length > 0 && (
             <span className="text-xs text-text">
-              {JSON.parse(system.key_features).length} features
+              {system.key_features.length} features
             </span>
           )}
         </div>
@@ -80,7 +80,7 @@ const Admin = () => {
     setEditingItem(item);
     Object.keys(item).forEach(key => {
       if (key === 'key_features' && item[key]) {
-        setValue(key, JSON.parse(item[key]).join(', '));
+        setValue(key, item[key].join(', '));
       } else {
         setValue(key, item[key]);
       }
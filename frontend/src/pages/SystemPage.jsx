@@ -14,9 +14,7 @@ const SystemPage = () => {
       try {
         const response = await systemsApi.getBySlug(slug);
         setSystem(response.data);
-        if (response.data.key_features) {
-          setFeatures(JSON.parse(response.data.key_features));
-        }
+        setFeatures(response.data.key_features || []);
       } catch (error) {
         console.error('Failed to fetch system:', error);
       } finally {